@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+Kontrola dostupnosti webov a formátu telefónov taxislužieb z TAXI_SERVICES.
+
+Weby sa kontrolujú paralelne cez asyncio + aiohttp so zdieľaným poolom
+spojení: globálny limit --concurrency, limit na host --per-host. Najprv HEAD
+(s presmerovaniami), pri chybe alebo 405/403/501 fallback na GET. Výsledky
+sa cachujú v lokálnom JSON s TTL, takže opakovaný beh overí len staré URL.
+
+Výstup je report podľa slugu mesta (link_report.json).
+
+Použitie: python check_taxi_links.py [--services FILE] [--concurrency 50]
+                                     [--per-host 4] [--timeout 10] [--ttl-hours 24]
+"""
+import argparse
+import asyncio
+import re
+import time
+
+from data_utils import load_json, load_taxi_services, write_json_if_changed
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+CACHE_PATH = 'link_check_cache.json'
+REPORT_PATH = 'link_report.json'
+USER_AGENT = 'TaxiVisionStudio/1.0'
+
+# Statusy, pri ktorých server nepodporuje HEAD - skúsime GET
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+
+PHONE_RE = re.compile(r'^(\+420)?[2-9]\d{8}$')
+
+def normalize_phone(phone):
+    return re.sub(r'[\s\-/()]', '', phone or '')
+
+def phone_valid(phone):
+    """České číslo: 9 číslic, voliteľne s predvoľbou +420"""
+    return bool(PHONE_RE.match(normalize_phone(phone)))
+
+def load_cache(path):
+    try:
+        return load_json(path)
+    except FileNotFoundError:
+        return {}
+
+async def fetch(session, method, url, timeout):
+    async with session.request(method, url, allow_redirects=True, timeout=timeout) as response:
+        if method == 'GET':
+            # Stačí začiatok tela, spojenie sa vráti do poolu
+            await response.content.read(1024)
+        return response.status, str(response.url)
+
+async def check_url(session, semaphore, url, timeout):
+    """Vráti výsledok kontroly jednej URL"""
+    async with semaphore:
+        start = time.perf_counter()
+        result = {"url": url, "status": None, "ok": False, "finalUrl": None, "error": None, "method": "HEAD"}
+        status, final_url = None, None
+        timed_out = False
+        try:
+            status, final_url = await fetch(session, 'HEAD', url, timeout)
+        except asyncio.TimeoutError:
+            # Pri timeoute už GET neskúšame, zbytočne by zdvojnásobil čas behu
+            result["error"] = "TimeoutError"
+            timed_out = True
+        except aiohttp.ClientError as e:
+            result["error"] = str(e) or type(e).__name__
+
+        if not timed_out and (status is None or status in HEAD_FALLBACK_STATUSES):
+            result["method"] = "GET"
+            try:
+                status, final_url = await fetch(session, 'GET', url, timeout)
+                result["error"] = None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                result["error"] = str(e) or type(e).__name__
+
+        result["status"] = status
+        result["finalUrl"] = final_url
+        result["ok"] = status is not None and 200 <= status < 400
+        result["ms"] = round((time.perf_counter() - start) * 1000)
+        result["checkedAt"] = time.time()
+        return result
+
+async def check_urls(urls, concurrency, per_host, timeout):
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host, ttl_dns_cache=300)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': USER_AGENT}) as session:
+        tasks = [check_url(session, semaphore, url, client_timeout) for url in urls]
+        return await asyncio.gather(*tasks)
+
+def build_report(services, results):
+    """Report podľa slugu mesta"""
+    report = {}
+    for slug in sorted(services):
+        entries = []
+        for svc in services[slug]:
+            entry = {
+                "name": svc["name"],
+                "phone": svc.get("phone"),
+                "phoneValid": phone_valid(svc.get("phone")),
+            }
+            website = svc.get("website")
+            if website:
+                r = results.get(website, {})
+                entry.update({
+                    "website": website,
+                    "ok": r.get("ok", False),
+                    "status": r.get("status"),
+                    "finalUrl": r.get("finalUrl"),
+                    "error": r.get("error"),
+                })
+            entries.append(entry)
+        report[slug] = entries
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Kontrola webov a telefónov taxislužieb")
+    parser.add_argument('--services', help="JSON {slug: [služby]} namiesto TAXI_SERVICES")
+    parser.add_argument('--concurrency', type=int, default=50, help="Globálny limit súbežných požiadaviek")
+    parser.add_argument('--per-host', type=int, default=4, help="Limit súbežných spojení na host")
+    parser.add_argument('--timeout', type=float, default=10.0, help="Timeout jednej požiadavky (s)")
+    parser.add_argument('--ttl-hours', type=float, default=24.0, help="Platnosť cache (hodiny)")
+    parser.add_argument('--no-cache', action='store_true', help="Ignorovať cache")
+    parser.add_argument('--cache', default=CACHE_PATH)
+    parser.add_argument('--output', default=REPORT_PATH)
+    args = parser.parse_args()
+
+    if aiohttp is None:
+        raise SystemExit("Chýba aiohttp: pip install aiohttp")
+
+    services = load_json(args.services) if args.services else load_taxi_services()
+    urls = sorted({svc['website'] for items in services.values() for svc in items if svc.get('website')})
+
+    cache = {} if args.no_cache else load_cache(args.cache)
+    now = time.time()
+    ttl = args.ttl_hours * 3600
+    fresh = {url: cache[url] for url in urls if url in cache and now - cache[url].get('checkedAt', 0) < ttl}
+    to_check = [url for url in urls if url not in fresh]
+    print(f"URL celkom: {len(urls)}, z cache: {len(fresh)}, kontrolujem: {len(to_check)}")
+
+    start = time.perf_counter()
+    checked = asyncio.run(check_urls(to_check, args.concurrency, args.per_host, args.timeout)) if to_check else []
+    took = time.perf_counter() - start
+
+    results = dict(fresh)
+    for r in checked:
+        results[r['url']] = r
+        cache[r['url']] = r
+    write_json_if_changed(args.cache, cache, manifest=False)
+
+    report = build_report(services, results)
+    write_json_if_changed(args.output, report, manifest=False)
+
+    broken = [r for r in results.values() if not r['ok']]
+    bad_phones = sum(1 for items in report.values() for e in items if not e['phoneValid'])
+    print(f"\n✓ Skontrolovaných {len(checked)} URL za {took:.1f}s")
+    print(f"  Nefunkčné weby: {len(broken)}")
+    print(f"  Neplatné telefóny: {bad_phones}")
+    for r in sorted(broken, key=lambda x: x['url'])[:20]:
+        print(f"  - {r['url']}: {r['status'] or r['error']}")
+    print(f"\n✓ Report uložený do {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,12 @@
 import csv
-import json
 
-def convert():
-    municipalities = []
+from data_utils import sort_records, write_json_array_stream
 
-    with open('souradnice_raw.csv', 'r', encoding='utf-8') as f:
+def read_municipalities(path):
+    with open(path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         for row in reader:
-            municipalities.append({
+            yield {
                 "name": row['Obec'],
                 "kod": row['Kód obce'],
                 "okres": row['Okres'],
@@ -17,28 +16,34 @@ def convert():
                 "psc": row['PSČ'],
                 "lat": float(row['Latitude']),
                 "lon": float(row['Longitude'])
-            })
+            }
+
+def convert():
+    kraje = {}
+    first = []
 
-    # Zoradiť podľa názvu
-    municipalities.sort(key=lambda x: x['name'])
+    def collect(records):
+        # Štatistiky sa zbierajú počas zápisu, zoznam sa nedrží v pamäti
+        for m in records:
+            kraje[m['kraj']] = kraje.get(m['kraj'], 0) + 1
+            if len(first) < 5:
+                first.append(m)
+            yield m
 
-    with open('obce_cz_gps.json', 'w', encoding='utf-8') as f:
-        json.dump(municipalities, f, ensure_ascii=False, indent=2)
+    # Zoradiť podľa názvu (pri veľkom vstupe cez dočasné súbory)
+    municipalities = sort_records(read_municipalities('souradnice_raw.csv'), key=lambda x: x['name'])
+    count, written = write_json_array_stream('obce_cz_gps.json', collect(municipalities))
 
-    print(f"✓ Skonvertovaných {len(municipalities)} obcí")
-    print(f"✓ Uložené do obce_cz_gps.json")
+    print(f"✓ Skonvertovaných {count} obcí")
+    print(f"✓ Uložené do obce_cz_gps.json" if written else "✓ obce_cz_gps.json bez zmeny")
 
     # Štatistiky
-    kraje = {}
-    for m in municipalities:
-        kraje[m['kraj']] = kraje.get(m['kraj'], 0) + 1
-
     print(f"\nPočet obcí podľa krajov:")
     for kraj, count in sorted(kraje.items(), key=lambda x: -x[1]):
         print(f"  {kraj}: {count}")
 
     print(f"\nPrvých 5:")
-    for m in municipalities[:5]:
+    for m in first:
         print(f"  - {m['name']} ({m['okres']}): {m['lat']}, {m['lon']}")
 
 if __name__ == "__main__":
@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""
+Spoločné pomôcky pre dátové skripty (načítanie/zápis JSON, vzdialenosti).
+"""
+import hashlib
+import importlib.util
+import json
+import heapq
+import math
+import os
+import pickle
+import re
+import stat
+import tempfile
+import unicodedata
+from datetime import datetime
+
+OBCE_PATH = 'obce_cz_gps.json'
+# Výstupy z Overpass (OSM schéma s osm_id, bez kod) - RÚIAN obce_cz_gps.json neprepisujú
+OBCE_OSM_PATH = 'obce_cz_osm.json'
+OBCE_OSM_PLACES_PATH = 'obce_cz_osm_places.json'
+MESTA_GPS_PATH = 'mesta_cz_gps.json'
+MESTA_KOMPLET_PATH = 'mesta_cz_komplet.json'
+MESTA_STATUT_PATH = 'mesta_statut.json'
+CITIES_PATH = os.path.join('src', 'data', 'cities.json')
+TAXI_SERVICES_PATH = os.path.join('scripts', 'populate_taxi_services.py')
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+# Manifest hashov dátových súborov, porovnáva ho ignored-build-step.sh
+MANIFEST_PATH = os.path.join(REPO_ROOT, 'data-manifest.txt')
+VOLATILE_KEYS = ('lastUpdated', 'generatedAt')
+MANIFEST_FILES = [OBCE_PATH, OBCE_OSM_PATH, OBCE_OSM_PLACES_PATH, MESTA_GPS_PATH, MESTA_KOMPLET_PATH, MESTA_STATUT_PATH, CITIES_PATH]
+
+# Počet záznamov, nad ktorým sa triedi cez dočasné súbory
+SORT_RUN_SIZE = 200000
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEG_LAT = 111.32
+
+def load_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_module(path, name):
+    """Načíta Python súbor ako modul nanovo (bez cache v sys.modules)"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def load_taxi_services():
+    """Vráti TAXI_SERVICES zo scripts/populate_taxi_services.py"""
+    return load_module(TAXI_SERVICES_PATH, '_taxi_services').TAXI_SERVICES
+
+def dump_json(data, compact=False):
+    """Kanonická serializácia: indent=2, UTF-8, poradie kľúčov podľa zápisu, floaty cez repr
+
+    compact=True zapíše minifikovaný JSON (bundle a dlaždice pre klienta).
+    """
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'), allow_nan=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, indent=2, allow_nan=False).encode('utf-8')
+
+def strip_volatile(data):
+    """Odstráni časové pečiatky, ktoré nemenia obsah dát"""
+    if isinstance(data, dict):
+        return {k: v for k, v in data.items() if k not in VOLATILE_KEYS}
+    return data
+
+def content_hash(data):
+    return hashlib.sha256(dump_json(strip_volatile(data))).hexdigest()
+
+def manifest_key(path):
+    return os.path.relpath(os.path.abspath(path), REPO_ROOT).replace(os.sep, '/')
+
+def read_manifest():
+    """Načíta manifest ako {cesta: (hash_obsahu, hash_súboru)}"""
+    entries = {}
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('#') or not line.strip():
+                    continue
+                path, content, raw = line.split()
+                entries[path] = (content, raw)
+    except FileNotFoundError:
+        pass
+    return entries
+
+def update_manifest(path, data, payload):
+    """Zapíše hash obsahu (bez časových pečiatok) a hash súboru do manifestu"""
+    set_manifest_entry(path, content_hash(data), hashlib.sha256(payload).hexdigest())
+
+def set_manifest_entry(path, content_sha, file_sha):
+    key = manifest_key(path)
+    if key.startswith('../'):
+        # Súbory mimo repozitára sa do manifestu nezapisujú
+        return
+    entries = read_manifest()
+    entry = (content_sha, file_sha)
+    if entries.get(key) == entry:
+        return
+    entries[key] = entry
+
+    lines = ["# path content_sha256 file_sha256\n"]
+    for k in sorted(entries):
+        lines.append(f"{k} {entries[k][0]} {entries[k][1]}\n")
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+def write_json_if_changed(path, data, stamp_key=None, manifest=True, compact=False):
+    """Zapíše JSON len ak sa obsah líši od súboru na disku, vráti True pri zápise.
+
+    Ak je zadaný stamp_key (napr. 'lastUpdated'), časová pečiatka sa nastaví
+    len vtedy, keď sa zmenil samotný obsah - inak zostane súbor nedotknutý.
+    Lokálne výstupy (reporty, cache) sa zapisujú s manifest=False.
+    """
+    try:
+        with open(path, 'rb') as f:
+            existing = f.read()
+    except FileNotFoundError:
+        existing = None
+
+    if stamp_key and existing is not None:
+        old = json.loads(existing)
+        if strip_volatile(old) == strip_volatile(data):
+            if stamp_key in old:
+                data[stamp_key] = old[stamp_key]
+            if manifest:
+                update_manifest(path, data, existing)
+            return False
+    if stamp_key:
+        data[stamp_key] = datetime.utcnow().isoformat() + 'Z'
+
+    payload = dump_json(data, compact=compact)
+    if manifest:
+        update_manifest(path, data, payload)
+    if payload == existing:
+        return False
+
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return True
+
+def _spill_run(run, tmp_dir):
+    """Zapíše zotriedený beh (kľúč, záznam) do dočasného súboru"""
+    run.sort(key=lambda x: x[0])
+    f = tempfile.TemporaryFile(dir=tmp_dir)
+    for item in run:
+        pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+    f.seek(0)
+    return f
+
+def _read_run(f):
+    while True:
+        try:
+            yield pickle.load(f)
+        except EOFError:
+            return
+
+def sort_records(records, key, run_size=SORT_RUN_SIZE, tmp_dir=None):
+    """Stabilne zotriedi záznamy podľa key, s obmedzenou pamäťou.
+
+    Kým sa vstup zmestí do run_size záznamov, triedi sa v pamäti. Inak sa
+    zotriedené behy (s predpočítaným kľúčom) odkladajú do dočasných súborov
+    a spájajú cez heapq.merge. Poradie je rovnaké ako pri list.sort(key=key).
+    Vracia generátor záznamov.
+    """
+    run = []
+    runs = []
+    for record in records:
+        run.append((key(record), record))
+        if len(run) >= run_size:
+            runs.append(_spill_run(run, tmp_dir))
+            run = []
+
+    if not runs:
+        run.sort(key=lambda x: x[0])
+        for _, record in run:
+            yield record
+        return
+
+    if run:
+        runs.append(_spill_run(run, tmp_dir))
+    try:
+        # heapq.merge je stabilný - pri zhode kľúča má prednosť skorší beh
+        for _, record in heapq.merge(*(_read_run(f) for f in runs), key=lambda x: x[0]):
+            yield record
+    finally:
+        for f in runs:
+            f.close()
+
+def write_json_array_stream(path, records, manifest=True):
+    """Zapíše zoznam záznamov postupne, bajtovo zhodne s dump_json(list).
+
+    Výstup ide do dočasného súboru, ktorý atomicky nahradí cieľ len ak sa
+    líši. Práva sa prevezmú z pôvodného súboru (nový súbor podľa umask).
+    Vráti (počet záznamov, True ak sa súbor zapísal).
+    """
+    digest = hashlib.sha256()
+    count = 0
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            def emit(chunk):
+                out.write(chunk)
+                digest.update(chunk)
+
+            for record in records:
+                item = json.dumps(record, ensure_ascii=False, indent=2, allow_nan=False)
+                emit((',\n  ' if count else '[\n  ').encode('utf-8'))
+                emit(item.replace('\n', '\n  ').encode('utf-8'))
+                count += 1
+            emit(b'\n]' if count else b'[]')
+
+        if manifest:
+            # Pre zoznam je obsah totožný so súborom
+            set_manifest_entry(path, digest.hexdigest(), digest.hexdigest())
+        return count, replace_if_changed(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def replace_if_changed(tmp_path, path):
+    """Nahradí path dočasným súborom, len ak sa líšia, vráti True pri zápise.
+
+    Dočasný súbor (z mkstemp v tom istom adresári) sa v každom prípade
+    odstráni. Práva sa prevezmú z pôvodného súboru (nový súbor podľa umask).
+    """
+    if os.path.exists(path) and _same_file(path, tmp_path):
+        os.remove(tmp_path)
+        return False
+    # mkstemp vytvára súbor s právami 0600
+    os.chmod(tmp_path, _target_mode(path))
+    os.replace(tmp_path, path)
+    return True
+
+def _target_mode(path):
+    """Práva existujúceho súboru, inak 0666 bez umask"""
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def _same_file(a, b, chunk_size=1 << 20):
+    if os.path.getsize(a) != os.path.getsize(b):
+        return False
+    with open(a, 'rb') as fa, open(b, 'rb') as fb:
+        while True:
+            ca = fa.read(chunk_size)
+            if ca != fb.read(chunk_size):
+                return False
+            if not ca:
+                return True
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Vzdušná vzdialenosť dvoch bodov v km"""
+    p1 = math.radians(lat1)
+    p2 = math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+def to_slug(text):
+    """Rovnaký slug ako toSlug v src/lib/municipality-data.ts"""
+    text = unicodedata.normalize('NFD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', '-', text).strip('-')
+
+def municipality_slugs(obce):
+    """Slug pre každú obec; pri rovnakom názve sa pridá okres, prípadne kód"""
+    by_name = {}
+    for o in obce:
+        by_name.setdefault(to_slug(o['name']), []).append(o)
+
+    slugs = []
+    used = set()
+    for o in obce:
+        slug = to_slug(o['name'])
+        if len(by_name[slug]) > 1:
+            slug = to_slug(f"{o['name']} {o['okres']}")
+        if slug in used:
+            slug = f"{slug}-{o['kod']}"
+        used.add(slug)
+        slugs.append(slug)
+    return slugs
+
+class GridIndex:
+    """Priestorový index - body rozdelené do mriežky buniek s veľkosťou ~cell_km"""
+
+    def __init__(self, points, cell_km=10.0):
+        # points: iterovateľné (lat, lon, item)
+        self.cell_km = cell_km
+        self.cell_deg = cell_km / KM_PER_DEG_LAT
+        self.cells = {}
+        self.size = 0
+        for lat, lon, item in points:
+            self.cells.setdefault(self.cell(lat, lon), []).append((lat, lon, item))
+            self.size += 1
+
+    def cell(self, lat, lon):
+        return (int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg)))
+
+    def query_radius(self, lat, lon, radius_km):
+        """Vráti [(vzdialenosť_km, item)] v okruhu radius_km, zoradené podľa vzdialenosti"""
+        rlat = radius_km / KM_PER_DEG_LAT
+        cos_lat = math.cos(math.radians(min(89.0, abs(lat) + rlat)))
+        rlon = radius_km / (KM_PER_DEG_LAT * max(cos_lat, 1e-6))
+        i0, j0 = self.cell(lat - rlat, lon - rlon)
+        i1, j1 = self.cell(lat + rlat, lon + rlon)
+
+        found = []
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                for plat, plon, item in self.cells.get((i, j), ()):
+                    d = haversine_km(lat, lon, plat, plon)
+                    if d <= radius_km:
+                        found.append((d, item))
+        found.sort(key=lambda x: x[0])
+        return found
+
+    def nearest(self, lat, lon, k=1, max_km=None):
+        """Vráti k najbližších [(vzdialenosť_km, item)], voliteľne len do max_km"""
+        limit = max_km if max_km is not None else math.pi * EARTH_RADIUS_KM
+        radius = min(self.cell_km, limit)
+        while True:
+            found = self.query_radius(lat, lon, radius)
+            if len(found) >= k or radius >= limit or len(found) == self.size:
+                return found[:k]
+            radius = min(radius * 2, limit)
+
+def main():
+    """Prepočíta manifest pre všetky známe dátové súbory"""
+    for path in MANIFEST_FILES:
+        full = os.path.join(REPO_ROOT, path)
+        if not os.path.exists(full):
+            continue
+        with open(full, 'rb') as f:
+            payload = f.read()
+        update_manifest(full, json.loads(payload), payload)
+        print(f"  {path}")
+    print(f"\n✓ Manifest uložený do {manifest_key(MANIFEST_PATH)}")
+
+if __name__ == "__main__":
+    main()
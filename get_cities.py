@@ -1,10 +1,42 @@
+# Obce z OSM (s osm_id) sa zapisujú do obce_cz_osm.json. RÚIAN zoznam
+# obce_cz_gps.json (kod, okres, psc) z get_cities_alt.py / convert_csv_to_json.py
+# zostáva nedotknutý - používajú ho joiny, mapa aj SQL sync.
+import argparse
 import requests
 import json
 import time
 
+import overpass_sync
+from data_utils import OBCE_OSM_PATH, write_json_if_changed
+
+OVERPASS_URL = "https://overpass-api.de/api/interpreter"
+SELECTORS = ['relation["boundary"="administrative"]["admin_level"="8"]']
+# Zmena geometrie členov nezmení pečiatku relácie (newer ju nevidí) - ťažiská
+# obnoví až plný beh
+FULL_EVERY_DAYS = 7
+
+def element_to_municipality(element):
+    """Prevedie Overpass relation na záznam obce, None ak chýbajú údaje"""
+    tags = element.get('tags', {})
+    name = tags.get('name')
+    center = element.get('center', {})
+    lat = center.get('lat')
+    lon = center.get('lon')
+
+    if name and lat and lon:
+        return {
+            "name": name,
+            "lat": lat,
+            "lon": lon,
+            "okres": tags.get('is_in:county', ''),
+            "kraj": tags.get('is_in:state', ''),
+            "osm_id": element.get('id')
+        }
+    return None
+
 def get_czech_municipalities():
     # Overpass API query: obce v Česku (boundary=administrative, admin_level=8)
-    overpass_url = "https://overpass-api.de/api/interpreter"
+    overpass_url = OVERPASS_URL
 
     # Správny query - ISO 3166-1 kód pre Česko je CZ
     overpass_query = """
@@ -46,21 +78,9 @@ def get_czech_municipalities():
     municipalities = []
     skipped = 0
     for element in data.get('elements', []):
-        name = element.get('tags', {}).get('name')
-        center = element.get('center', {})
-        lat = center.get('lat')
-        lon = center.get('lon')
-
-        if name and lat and lon:
-            tags = element.get('tags', {})
-            municipalities.append({
-                "name": name,
-                "lat": lat,
-                "lon": lon,
-                "okres": tags.get('is_in:county', ''),
-                "kraj": tags.get('is_in:state', ''),
-                "osm_id": element.get('id')
-            })
+        record = element_to_municipality(element)
+        if record:
+            municipalities.append(record)
         else:
             skipped += 1
 
@@ -69,15 +89,36 @@ def get_czech_municipalities():
     # Zoradenie podľa názvu
     municipalities.sort(key=lambda x: x['name'])
 
-    with open('obce_cz_gps.json', 'w', encoding='utf-8') as f:
-        json.dump(municipalities, f, ensure_ascii=False, indent=2)
-
-    print(f"\nHotovo! Uložených {len(municipalities)} obcí do obce_cz_gps.json")
+    if write_json_if_changed(OBCE_OSM_PATH, municipalities):
+        print(f"\nHotovo! Uložených {len(municipalities)} obcí do {OBCE_OSM_PATH}")
+    else:
+        print(f"\nHotovo! {OBCE_OSM_PATH} bez zmeny ({len(municipalities)} obcí)")
+    overpass_sync.save_state('get_cities', OBCE_OSM_PATH, data)
 
     # Ukážka prvých 10 záznamov
     print("\nPrvých 10 záznamov:")
     for m in municipalities[:10]:
         print(f"  - {m['name']}: {m['lat']:.6f}, {m['lon']:.6f}")
 
+def main():
+    parser = argparse.ArgumentParser(description="Obce ČR z Overpass API (admin_level=8)")
+    parser.add_argument('--incremental', action='store_true', help="Stiahnuť len zmeny od posledného behu")
+    parser.add_argument('--since', help="Časová pečiatka pre prvý inkrementálny beh (ISO 8601)")
+    parser.add_argument('--full-every-days', type=float, default=FULL_EVERY_DAYS,
+                        help="Pri --incremental spustiť plný beh, ak je posledný starší")
+    args = parser.parse_args()
+
+    if args.incremental and not args.since and overpass_sync.full_run_due('get_cities', args.full_every_days):
+        print(f"Posledný plný beh je starší ako {args.full_every_days:g} dní - sťahujem všetko")
+        args.incremental = False
+
+    if args.incremental:
+        overpass_sync.run_incremental(
+            'get_cities', OBCE_OSM_PATH, SELECTORS, 'center',
+            element_to_municipality, [OVERPASS_URL], timeout=300, since=args.since
+        )
+    else:
+        get_czech_municipalities()
+
 if __name__ == "__main__":
-    get_czech_municipalities()
+    main()
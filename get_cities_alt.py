@@ -1,7 +1,44 @@
+import argparse
 import requests
-import json
 import csv
-from io import StringIO
+from collections import deque
+from itertools import chain
+
+import overpass_sync
+from data_utils import OBCE_OSM_PLACES_PATH, OBCE_PATH, sort_records, write_json_array_stream
+
+OVERPASS_MIRROR = "https://overpass.kumi.systems/api/interpreter"
+SELECTORS = ['node["place"~"city|town|village"]']
+
+def element_to_place(el):
+    """Prevedie Overpass node na záznam obce, None ak chýbajú údaje"""
+    name = el.get('tags', {}).get('name')
+    lat = el.get('lat')
+    lon = el.get('lon')
+    if name and lat and lon:
+        return {
+            "name": name,
+            "lat": lat,
+            "lon": lon,
+            "type": el.get('tags', {}).get('place', ''),
+            "osm_id": el.get('id')
+        }
+    return None
+
+def csv_to_places(lines):
+    """Záznamy obcí z riadkov CSV, postupne (celý súbor nie je v pamäti)"""
+    for row in csv.DictReader(lines):
+        # Štruktúra CSV: kod,nazev,nazev_ascii,okres_kod,okres_nazev,kraj_kod,kraj_nazev,psc,lat,lng
+        if row.get('lat') and row.get('lng') and row.get('nazev'):
+            yield {
+                "name": row['nazev'],
+                "lat": float(row['lat']),
+                "lon": float(row['lng']),
+                "okres": row.get('okres_nazev', ''),
+                "kraj": row.get('kraj_nazev', ''),
+                "kod": row.get('kod', ''),
+                "psc": row.get('psc', '')
+            }
 
 def download_from_github():
     """Stiahne zoznam českých obcí z GitHubu (vyskocilm/czech-cities)"""
@@ -15,7 +52,7 @@ def download_from_github():
         },
         {
             "name": "Overpass mirror (kumi.systems)",
-            "url": "https://overpass.kumi.systems/api/interpreter",
+            "url": OVERPASS_MIRROR,
             "parser": "overpass"
         }
     ]
@@ -23,30 +60,13 @@ def download_from_github():
     # Skúsime GitHub CSV
     print("Skúšam GitHub repository (vyskocilm/czech-cities)...")
     try:
-        response = requests.get(sources[0]["url"], timeout=30)
-        response.raise_for_status()
-
-        # Parse CSV
-        municipalities = []
-        reader = csv.DictReader(StringIO(response.text))
-
-        for row in reader:
-            # Štruktúra CSV: kod,nazev,nazev_ascii,okres_kod,okres_nazev,kraj_kod,kraj_nazev,psc,lat,lng
-            if row.get('lat') and row.get('lng') and row.get('nazev'):
-                municipalities.append({
-                    "name": row['nazev'],
-                    "lat": float(row['lat']),
-                    "lon": float(row['lng']),
-                    "okres": row.get('okres_nazev', ''),
-                    "kraj": row.get('kraj_nazev', ''),
-                    "kod": row.get('kod', ''),
-                    "psc": row.get('psc', '')
-                })
-
-        if municipalities:
-            municipalities.sort(key=lambda x: x['name'])
-            save_results(municipalities)
-            return
+        # CSV sa číta postupne po riadkoch rovno do triedenia
+        with requests.get(sources[0]["url"], timeout=30, stream=True) as response:
+            response.raise_for_status()
+            if response.encoding is None:
+                response.encoding = 'utf-8'
+            if save_results(csv_to_places(response.iter_lines(decode_unicode=True)), OBCE_PATH):
+                return
 
     except Exception as e:
         print(f"  Chyba: {e}")
@@ -72,23 +92,10 @@ def download_from_github():
         response.raise_for_status()
         data = response.json()
 
-        municipalities = []
-        for el in data.get('elements', []):
-            name = el.get('tags', {}).get('name')
-            lat = el.get('lat')
-            lon = el.get('lon')
-            if name and lat and lon:
-                municipalities.append({
-                    "name": name,
-                    "lat": lat,
-                    "lon": lon,
-                    "type": el.get('tags', {}).get('place', ''),
-                    "osm_id": el.get('id')
-                })
-
-        if municipalities:
-            municipalities.sort(key=lambda x: x['name'])
-            save_results(municipalities)
+        places = (r for r in map(element_to_place, data.get('elements', [])) if r is not None)
+        # OSM uzly nemajú kod/okres - ukladajú sa vedľa RÚIAN zoznamu
+        if save_results(places, OBCE_OSM_PLACES_PATH):
+            overpass_sync.save_state('get_cities_alt', OBCE_OSM_PLACES_PATH, data)
             return
 
     except Exception as e:
@@ -96,20 +103,58 @@ def download_from_github():
 
     print("\nVšetky zdroje zlyhali. Skús neskôr alebo použi manuálny download.")
 
-def save_results(municipalities):
-    with open('obce_cz_gps.json', 'w', encoding='utf-8') as f:
-        json.dump(municipalities, f, ensure_ascii=False, indent=2)
-
-    print(f"\n✓ Uložených {len(municipalities)} obcí do obce_cz_gps.json")
+def save_results(municipalities, path):
+    """Zotriedi a zapíše obce (iterovateľné, aj generátor) do path, vráti ich počet.
+
+    Prázdny vstup sa nezapíše - vráti 0.
+    """
+    first = []
+    last = deque(maxlen=5)
+
+    def collect(records):
+        for m in records:
+            if len(first) < 10:
+                first.append(m)
+            last.append(m)
+            yield m
+
+    # Zoradenie podľa názvu - veľké vstupy sa triedia cez dočasné súbory
+    records = sort_records(municipalities, key=lambda x: x['name'])
+    head = next(records, None)
+    if head is None:
+        return 0
+    count, written = write_json_array_stream(path, collect(chain([head], records)))
+
+    if written:
+        print(f"\n✓ Uložených {count} obcí do {path}")
+    else:
+        print(f"\n✓ {path} bez zmeny ({count} obcí)")
 
     print("\nPrvých 10 záznamov:")
-    for m in municipalities[:10]:
+    for m in first:
         print(f"  - {m['name']}: {m['lat']:.6f}, {m['lon']:.6f}")
 
     # Štatistiky
     print(f"\nPosledných 5 záznamov:")
-    for m in municipalities[-5:]:
+    for m in last:
         print(f"  - {m['name']}: {m['lat']:.6f}, {m['lon']:.6f}")
 
+    return count
+
+def main():
+    parser = argparse.ArgumentParser(description="Obce ČR z GitHub CSV, záložne z Overpass")
+    parser.add_argument('--incremental', action='store_true',
+                        help=f"Stiahnuť len zmeny z Overpass od posledného Overpass behu (do {OBCE_OSM_PLACES_PATH})")
+    parser.add_argument('--since', help="Časová pečiatka pre prvý inkrementálny beh (ISO 8601)")
+    args = parser.parse_args()
+
+    if args.incremental:
+        overpass_sync.run_incremental(
+            'get_cities_alt', OBCE_OSM_PLACES_PATH, SELECTORS, 'body',
+            element_to_place, [OVERPASS_MIRROR], timeout=180, since=args.since
+        )
+    else:
+        download_from_github()
+
 if __name__ == "__main__":
-    download_from_github()
+    main()
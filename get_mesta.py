@@ -1,15 +1,35 @@
+import argparse
 import requests
-import json
+
+import overpass_sync
+from data_utils import write_json_if_changed
+
+# Alternatívny mirror - overpass.kumi.systems
+MIRRORS = [
+    "https://overpass.kumi.systems/api/interpreter",
+    "https://maps.mail.ru/osm/tools/overpass/api/interpreter",
+    "https://overpass-api.de/api/interpreter"
+]
+SELECTORS = ['node["place"="city"]', 'node["place"="town"]']
+
+def element_to_mesto(el):
+    """Prevedie Overpass node na záznam mesta, None ak nemá názov"""
+    tags = el.get('tags', {})
+    name = tags.get('name')
+    if not name:
+        return None
+    return {
+        "name": name,
+        "lat": el.get('lat'),
+        "lon": el.get('lon'),
+        "type": tags.get('place'),
+        "population": tags.get('population', ''),
+        "osm_id": el.get('id')
+    }
 
 def get_czech_cities():
     """Stiahne len mestá (city + town) z Overpass API"""
-    
-    # Alternatívny mirror - overpass.kumi.systems
-    mirrors = [
-        "https://overpass.kumi.systems/api/interpreter",
-        "https://maps.mail.ru/osm/tools/overpass/api/interpreter",
-        "https://overpass-api.de/api/interpreter"
-    ]
+    mirrors = MIRRORS
     
     query = """
     [out:json][timeout:120];
@@ -41,6 +61,18 @@ def get_czech_cities():
     return None
 
 def main():
+    parser = argparse.ArgumentParser(description="Mestá ČR (city + town) z Overpass API")
+    parser.add_argument('--incremental', action='store_true', help="Stiahnuť len zmeny od posledného behu")
+    parser.add_argument('--since', help="Časová pečiatka pre prvý inkrementálny beh (ISO 8601)")
+    args = parser.parse_args()
+
+    if args.incremental:
+        overpass_sync.run_incremental(
+            'get_mesta', 'mesta_cz_gps.json', SELECTORS, 'body',
+            element_to_mesto, MIRRORS, timeout=120, since=args.since
+        )
+        return
+
     data = get_czech_cities()
     
     if not data:
@@ -51,21 +83,10 @@ def main():
     towns = []
     
     for el in data.get('elements', []):
-        tags = el.get('tags', {})
-        name = tags.get('name')
-        place_type = tags.get('place')
+        item = element_to_mesto(el)
         
-        if name:
-            item = {
-                "name": name,
-                "lat": el.get('lat'),
-                "lon": el.get('lon'),
-                "type": place_type,
-                "population": tags.get('population', ''),
-                "osm_id": el.get('id')
-            }
-            
-            if place_type == 'city':
+        if item:
+            if item['type'] == 'city':
                 cities.append(item)
             else:
                 towns.append(item)
@@ -76,10 +97,11 @@ def main():
     all_mesta = cities + towns
     all_mesta.sort(key=lambda x: x['name'])
     
-    with open('mesta_cz_gps.json', 'w', encoding='utf-8') as f:
-        json.dump(all_mesta, f, ensure_ascii=False, indent=2)
-    
-    print(f"\n✓ Uložených {len(all_mesta)} miest do mesta_cz_gps.json")
+    if write_json_if_changed('mesta_cz_gps.json', all_mesta):
+        print(f"\n✓ Uložených {len(all_mesta)} miest do mesta_cz_gps.json")
+    else:
+        print(f"\n✓ mesta_cz_gps.json bez zmeny ({len(all_mesta)} miest)")
+    overpass_sync.save_state('get_mesta', 'mesta_cz_gps.json', data)
     print(f"  - city (veľké mestá): {len(cities)}")
     print(f"  - town (menšie mestá): {len(towns)}")
     
@@ -5,9 +5,12 @@
 # Exit code 1 = Continue build (deploy)
 #
 # This script prevents unnecessary Vercel deployments when only staged files change
+# or when data files changed only in their timestamps (see data-manifest.txt)
 
 echo "Checking if build should be skipped..."
 
+MANIFEST="data-manifest.txt"
+
 # Získaj zoznam zmenených súborov v tomto commite
 CHANGED_FILES=$(git diff --name-only HEAD~1 HEAD 2>/dev/null || echo "")
 
@@ -23,6 +26,39 @@ if [ -n "$CHANGED_FILES" ]; then
     echo "✓ Only staged files changed. Skipping deployment."
     exit 0
   fi
+
+  # Ak sa zmenili len dátové súbory z manifestu a ich hash obsahu (bez
+  # lastUpdated/generatedAt) je rovnaký ako v predchádzajúcom commite, preskoč
+  if [ -f "$MANIFEST" ]; then
+    PREV_MANIFEST=$(git show "HEAD~1:$MANIFEST" 2>/dev/null || echo "")
+    DATA_ONLY=1
+
+    for FILE in $NON_STAGED_FILES; do
+      [ "$FILE" = "$MANIFEST" ] && continue
+
+      CURRENT=$(awk -v f="$FILE" '$1 == f { print $2 " " $3 }' "$MANIFEST")
+      if [ -z "$CURRENT" ]; then
+        DATA_ONLY=0
+        break
+      fi
+
+      CONTENT_HASH=${CURRENT% *}
+      FILE_HASH=${CURRENT#* }
+      PREV_HASH=$(echo "$PREV_MANIFEST" | awk -v f="$FILE" '$1 == f { print $2 }')
+      ACTUAL_HASH=$(sha256sum "$FILE" 2>/dev/null | cut -d' ' -f1)
+
+      # Manifest musí sedieť so súborom (inak bol upravený ručne) a obsah sa nesmie líšiť
+      if [ "$ACTUAL_HASH" != "$FILE_HASH" ] || [ "$CONTENT_HASH" != "$PREV_HASH" ]; then
+        DATA_ONLY=0
+        break
+      fi
+    done
+
+    if [ "$DATA_ONLY" = "1" ]; then
+      echo "✓ Data files changed only in timestamps. Skipping deployment."
+      exit 0
+    fi
+  fi
 fi
 
 # Ak sa zmenili iné súbory, pokračuj s deploymentom
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Spájanie RÚIAN obcí, štatútov miest a OSM uzlov podľa kódu a polohy.
+
+  - mesta_statut.json  x obce_cz_gps.json : hash join podľa `kod`
+  - mesta_cz_gps.json  x obce_cz_gps.json : priestorový join - OSM uzol sa
+    priradí najbližšej obci do --radius-km (pri zhode názvu má prednosť obec
+    s rovnakým názvom, ak je v okruhu)
+
+Oba joiny bežia v lineárnom čase (hash mapa + mriežkový index). Nespárované
+riadky a konflikty sa zapíšu do join_report.json.
+
+Z výsledku joinov (obce so štatútom mesta alebo s OSM uzlom city/town)
+vzniká mesta_cz_komplet.json - zapisuje ho create_mesta_komplet.py a
+watch_data.py, report ukazuje rozdiel oproti súboru na disku.
+
+Použitie: python join_datasets.py [--radius-km 5]
+"""
+import argparse
+
+from data_utils import (
+    MESTA_GPS_PATH, MESTA_KOMPLET_PATH, MESTA_STATUT_PATH, OBCE_PATH, GridIndex,
+    load_json, write_json_if_changed,
+)
+
+REPORT_PATH = 'join_report.json'
+RADIUS_KM = 5.0
+NEAREST_CANDIDATES = 5
+
+def join_statut(obce, statut):
+    """Hash join podľa kod, vráti ({kod: statut_záznam}, nespárované)"""
+    obce_by_kod = {o['kod']: o for o in obce}
+    matched = {}
+    unmatched = []
+    for s in statut:
+        if s['kod'] in obce_by_kod:
+            matched[s['kod']] = s
+        else:
+            unmatched.append(s)
+    return matched, unmatched
+
+def join_osm(obce, osm_nodes, radius_km):
+    """Priradí OSM uzly k obciam, vráti ({kod: (uzol, km)}, nespárované, konflikty)"""
+    index = GridIndex(((o['lat'], o['lon'], o) for o in obce), cell_km=radius_km)
+    matched = {}
+    unmatched = []
+    conflicts = []
+
+    for node in osm_nodes:
+        candidates = index.nearest(node['lat'], node['lon'], k=NEAREST_CANDIDATES, max_km=radius_km)
+        if not candidates:
+            unmatched.append(node)
+            continue
+        # Rovnaký názov v okruhu má prednosť pred čisto najbližšou obcou
+        same_name = [c for c in candidates if c[1]['name'] == node['name']]
+        distance, obec = (same_name or candidates)[0]
+
+        current = matched.get(obec['kod'])
+        if current is None:
+            matched[obec['kod']] = (node, distance)
+            continue
+        # Viac uzlov na jednu obec - ponecháme bližší, druhý do konfliktov
+        if distance < current[1]:
+            matched[obec['kod']] = (node, distance)
+            node, distance = current
+        conflicts.append({"kod": obec['kod'], "obec": obec['name'], "osm_id": node['osm_id'],
+                          "osm_name": node['name'], "distance_km": round(distance, 3)})
+
+    return matched, unmatched, conflicts
+
+def mesta_from_joins(obce, statut_matched, osm_matched):
+    """Mestá v tvare mesta_cz_komplet.json odvodené z joinov"""
+    mesta = []
+    for o in obce:
+        if o['kod'] in statut_matched or o['kod'] in osm_matched:
+            mesta.append({
+                "name": o['name'],
+                "kod": o['kod'],
+                "lat": o['lat'],
+                "lon": o['lon'],
+                "okres": o['okres'],
+                "kraj": o['kraj']
+            })
+    mesta.sort(key=lambda x: x['name'])
+    return mesta
+
+def main():
+    parser = argparse.ArgumentParser(description="Join RÚIAN, OSM a štatútov miest")
+    parser.add_argument('--radius-km', type=float, default=RADIUS_KM, help="Max. vzdialenosť OSM uzla od obce")
+    parser.add_argument('--report', default=REPORT_PATH)
+    args = parser.parse_args()
+
+    obce = load_json(OBCE_PATH)
+    statut = load_json(MESTA_STATUT_PATH)
+    osm_nodes = load_json(MESTA_GPS_PATH)
+    print(f"Obce: {len(obce)}, štatúty: {len(statut)}, OSM uzly: {len(osm_nodes)}")
+
+    statut_matched, statut_unmatched = join_statut(obce, statut)
+    print(f"\nŠtatúty podľa kod: spárovaných {len(statut_matched)}, nespárovaných {len(statut_unmatched)}")
+
+    osm_matched, osm_unmatched, conflicts = join_osm(obce, osm_nodes, args.radius_km)
+    name_mismatch = []
+    for o in obce:
+        if o['kod'] not in osm_matched:
+            continue
+        node, distance = osm_matched[o['kod']]
+        if node['name'] != o['name']:
+            name_mismatch.append({"kod": o['kod'], "obec": o['name'], "osm_id": node['osm_id'],
+                                  "osm_name": node['name'], "distance_km": round(distance, 3)})
+    print(f"OSM uzly do {args.radius_km} km: spárovaných {len(osm_matched)}, "
+          f"nespárovaných {len(osm_unmatched)}, konfliktov {len(conflicts)}, iný názov {len(name_mismatch)}")
+
+    mesta = mesta_from_joins(obce, statut_matched, osm_matched)
+    komplet = load_json(MESTA_KOMPLET_PATH)
+    current = {m['kod'] for m in komplet}
+    derived = {m['kod'] for m in mesta}
+    print(f"\nMestá z joinov: {len(mesta)} (v {MESTA_KOMPLET_PATH}: {len(current)}, "
+          f"navyše {len(derived - current)}, chýba {len(current - derived)})")
+
+    report = {
+        "radiusKm": args.radius_km,
+        "statutUnmatched": statut_unmatched,
+        "osmUnmatched": osm_unmatched,
+        "osmConflicts": conflicts,
+        "osmNameMismatch": name_mismatch,
+        "mestaAdded": sorted(m['name'] for m in mesta if m['kod'] not in current),
+        "mestaMissing": sorted(m['name'] for m in komplet if m['kod'] not in derived),
+    }
+    write_json_if_changed(args.report, report, manifest=False)
+    print(f"✓ Report uložený do {args.report}")
+
+if __name__ == "__main__":
+    main()
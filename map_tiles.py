@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Statická pyramída dlaždíc z/x/y (web mercator) s obcami a mestami s taxi.
+
+Body z obce_cz_gps.json (mestá z mesta_cz_komplet.json a počty taxislužieb
+z TAXI_SERVICES) sa raz prepočítajú na celočíselné súradnice na najvyššom
+zoome. Dlaždica na nižšom zoome je len bitový posun (x >> k, y >> k), takže
+každá úroveň je jeden lineárny prechod bez ďalšej trigonometrie.
+
+  - zoom < --points-zoom : agregované počty v mriežke CELLS x CELLS na dlaždicu
+                           (obce, mestá, taxislužby + ťažisko bunky)
+  - zoom >= --points-zoom: jednotlivé body
+
+Každá dlaždica je minifikovaný JSON v --out-dir/z/x/y.json, zoznam dlaždíc
+a počtov je v --out-dir/manifest.json. Klient načíta len dlaždice výrezu.
+Dlaždice nie sú v gite ani v builde - generujú sa explicitne týmto skriptom,
+kým ich nepoužíva mapa.
+
+Použitie: python map_tiles.py [--min-zoom 6] [--points-zoom 10] [--max-zoom 12]
+                              [--out-dir public/tiles]
+"""
+import argparse
+import math
+import os
+import time
+
+from data_utils import (
+    MESTA_KOMPLET_PATH, OBCE_PATH, load_json, load_taxi_services, municipality_slugs,
+    to_slug, write_json_if_changed,
+)
+
+# Počet buniek na stranu dlaždice pre agregované zoomy
+CELLS = 8
+CELL_BITS = 3  # log2(CELLS)
+
+def mercator(lat, lon):
+    """Normalizované web mercator súradnice v rozsahu 0..1"""
+    x = (lon + 180.0) / 360.0
+    s = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + s) / (1 - s)) / (4 * math.pi)
+    return x, y
+
+def load_points():
+    obce = load_json(OBCE_PATH)
+    slugs = municipality_slugs(obce)
+    mesta_kody = {m['kod'] for m in load_json(MESTA_KOMPLET_PATH)}
+    taxi_counts = {slug: len(services) for slug, services in load_taxi_services().items()}
+
+    points = []
+    for o, slug in zip(obce, slugs):
+        mesto = o['kod'] in mesta_kody
+        points.append({
+            "name": o['name'],
+            "slug": slug,
+            "kod": o['kod'],
+            "lat": o['lat'],
+            "lon": o['lon'],
+            "mesto": mesto,
+            # Taxislužby sú v TAXI_SERVICES podľa slugu mesta (bez okresu)
+            "taxi": taxi_counts.get(to_slug(o['name']), 0) if mesto else 0,
+        })
+    return points
+
+def bin_points(points, max_zoom):
+    """Celočíselné súradnice bodov na (max_zoom + CELL_BITS) - základ pre všetky zoomy"""
+    scale = 1 << (max_zoom + CELL_BITS)
+    binned = []
+    for p in points:
+        x, y = mercator(p['lat'], p['lon'])
+        binned.append((min(int(x * scale), scale - 1), min(int(y * scale), scale - 1), p))
+    return binned
+
+def aggregate_tiles(binned, zoom, max_zoom):
+    """{(x, y): {(cx, cy): [obce, mestá, taxi, sum_lat, sum_lon]}} pre zoom"""
+    shift = max_zoom - zoom
+    tiles = {}
+    for px, py, p in binned:
+        cx = px >> shift
+        cy = py >> shift
+        tile = tiles.setdefault((cx >> CELL_BITS, cy >> CELL_BITS), {})
+        cell = tile.setdefault((cx & (CELLS - 1), cy & (CELLS - 1)), [0, 0, 0, 0.0, 0.0])
+        cell[0] += 1
+        cell[1] += p['mesto']
+        cell[2] += p['taxi']
+        cell[3] += p['lat']
+        cell[4] += p['lon']
+    return tiles
+
+def point_tiles(binned, zoom, max_zoom):
+    """{(x, y): [body]} pre zoom"""
+    shift = max_zoom - zoom + CELL_BITS
+    tiles = {}
+    for px, py, p in binned:
+        tiles.setdefault((px >> shift, py >> shift), []).append(p)
+    return tiles
+
+def aggregate_payload(zoom, x, y, cells):
+    out = []
+    for (cx, cy), (count, mesta, taxi, sum_lat, sum_lon) in sorted(cells.items()):
+        out.append({
+            "c": [cx, cy],
+            "obce": count,
+            "mesta": mesta,
+            "taxi": taxi,
+            "lat": round(sum_lat / count, 5),
+            "lon": round(sum_lon / count, 5),
+        })
+    return {"z": zoom, "x": x, "y": y, "type": "aggregate", "cells": out}
+
+def points_payload(zoom, x, y, points):
+    out = []
+    for p in sorted(points, key=lambda p: (-p['taxi'], -p['mesto'], p['name'], p['kod'])):
+        out.append({
+            "name": p['name'],
+            "slug": p['slug'],
+            "lat": p['lat'],
+            "lon": p['lon'],
+            "mesto": p['mesto'],
+            "taxi": p['taxi'],
+        })
+    return {"z": zoom, "x": x, "y": y, "type": "points", "points": out}
+
+def remove_stale(out_dir, keep):
+    """Zmaže dlaždice z predchádzajúceho behu, ktoré už nevznikli.
+
+    Maže len cesty z predchádzajúceho manifest.json (nie iné JSON súbory v
+    --out-dir) a z/x adresáre, ktoré po nich zostali prázdne.
+    """
+    try:
+        previous = load_json(os.path.join(out_dir, 'manifest.json'))
+    except FileNotFoundError:
+        return 0
+
+    removed = 0
+    for zoom, entries in previous.get('zooms', {}).items():
+        zoom_dir = os.path.join(out_dir, str(int(zoom)))
+        for x, y, _ in entries:
+            x_dir = os.path.join(zoom_dir, str(int(x)))
+            path = os.path.join(x_dir, f"{int(y)}.json")
+            if path in keep or not os.path.exists(path):
+                continue
+            os.remove(path)
+            removed += 1
+            for directory in (x_dir, zoom_dir):
+                if os.path.isdir(directory) and not os.listdir(directory):
+                    os.rmdir(directory)
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description="Pyramída dlaždíc obcí a miest s taxi")
+    parser.add_argument('--min-zoom', type=int, default=6)
+    parser.add_argument('--points-zoom', type=int, default=10, help="Od tohto zoomu jednotlivé body")
+    parser.add_argument('--max-zoom', type=int, default=12)
+    parser.add_argument('--out-dir', default=os.path.join('public', 'tiles'))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    points = load_points()
+    binned = bin_points(points, args.max_zoom)
+    print(f"Načítaných {len(points)} bodov, zoomy {args.min_zoom}-{args.max_zoom} "
+          f"(body od {args.points_zoom})")
+
+    manifest = {
+        "minZoom": args.min_zoom,
+        "maxZoom": args.max_zoom,
+        "pointsZoom": args.points_zoom,
+        "cells": CELLS,
+        "bounds": [
+            min(p['lon'] for p in points), min(p['lat'] for p in points),
+            max(p['lon'] for p in points), max(p['lat'] for p in points),
+        ],
+        "zooms": {},
+    }
+
+    written = 0
+    paths = set()
+    for zoom in range(args.min_zoom, args.max_zoom + 1):
+        if zoom < args.points_zoom:
+            tiles = aggregate_tiles(binned, zoom, args.max_zoom)
+            payloads = {key: aggregate_payload(zoom, key[0], key[1], cells) for key, cells in tiles.items()}
+        else:
+            tiles = point_tiles(binned, zoom, args.max_zoom)
+            payloads = {key: points_payload(zoom, key[0], key[1], pts) for key, pts in tiles.items()}
+
+        entries = []
+        for (x, y), payload in sorted(payloads.items()):
+            directory = os.path.join(args.out_dir, str(zoom), str(x))
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, f"{y}.json")
+            paths.add(path)
+            if write_json_if_changed(path, payload, manifest=False, compact=True):
+                written += 1
+            count = sum(c['obce'] for c in payload['cells']) if 'cells' in payload else len(payload['points'])
+            entries.append([x, y, count])
+
+        manifest['zooms'][str(zoom)] = entries
+        print(f"  z{zoom}: {len(entries)} dlaždíc")
+
+    removed = remove_stale(args.out_dir, paths)
+    write_json_if_changed(os.path.join(args.out_dir, 'manifest.json'), manifest, manifest=False, compact=True)
+
+    took = time.perf_counter() - start
+    print(f"\n✓ {len(paths)} dlaždíc v {args.out_dir}/ (zapísaných {written}, zmazaných {removed}) za {took:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Generovanie malých JSON bundlov pre každú obec (podklad pre prerender).
+
+Bundle obsahuje záznam obce, PSČ, najbližšie mestá s taxislužbami a
+najbližšie obce z toho istého okresu. Obce z obce_cz_gps.json sa rozdelia
+podľa okresu medzi procesy v poole. Bundly obcí, ktoré už nie sú v
+index.json, sa zmažú.
+
+Gazetteer sa načíta raz v rodičovskom procese. Pri štarte cez fork ho
+workery zdedia ako zdieľanú pamäť (copy-on-write, po gc.freeze()), takže sa
+nepickluje do každého procesu - úlohy nesú len názov okresu. Nezmenené
+bundly sa neprepisujú.
+
+Použitie: python municipality_bundles.py [--out-dir municipality_bundles]
+                                         [--taxi-cities 5] [--neighbours 10] [--workers N]
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import time
+
+from data_utils import (
+    MESTA_KOMPLET_PATH, OBCE_PATH, TAXI_SERVICES_PATH, GridIndex, haversine_km,
+    load_json, load_module, municipality_slugs, to_slug, write_json_if_changed,
+)
+
+# Zdieľaný stav (v rodičovi pred forkom, alebo cez init_worker)
+_shared = None
+
+def load_shared():
+    """Načíta gazetteer a taxislužby do štruktúry zdieľanej medzi workermi"""
+    obce = load_json(OBCE_PATH)
+    slugs = municipality_slugs(obce)
+    taxi_module = load_module(TAXI_SERVICES_PATH, '_taxi_services')
+
+    # Súradnice miest s taxislužbami - najprv mesta_cz_komplet, potom obce
+    coords = {}
+    for o in obce:
+        coords.setdefault(to_slug(o['name']), o)
+    for m in load_json(MESTA_KOMPLET_PATH):
+        coords[to_slug(m['name'])] = m
+
+    taxi_cities = []
+    for slug, services in taxi_module.TAXI_SERVICES.items():
+        place = coords.get(slug)
+        if place is None:
+            continue
+        taxi_cities.append({
+            "name": place['name'],
+            "slug": slug,
+            "lat": place['lat'],
+            "lon": place['lon'],
+            "taxiServices": taxi_module.build_city_services(services),
+        })
+
+    by_okres = {}
+    for i, o in enumerate(obce):
+        by_okres.setdefault(o['okres'], []).append(i)
+
+    return {
+        "obce": obce,
+        "slugs": slugs,
+        "by_okres": by_okres,
+        "taxi_cities": taxi_cities,
+        "taxi_index": GridIndex(((c['lat'], c['lon'], c) for c in taxi_cities), cell_km=20),
+    }
+
+def init_worker(shared):
+    global _shared
+    _shared = shared
+
+def build_bundle(i, options):
+    obce = _shared['obce']
+    slugs = _shared['slugs']
+    o = obce[i]
+
+    neighbours = []
+    for j in _shared['by_okres'][o['okres']]:
+        if j == i:
+            continue
+        n = obce[j]
+        neighbours.append((haversine_km(o['lat'], o['lon'], n['lat'], n['lon']), j))
+    neighbours.sort()
+
+    taxi = _shared['taxi_index'].nearest(o['lat'], o['lon'], k=options['taxi_cities'])
+
+    return {
+        "slug": slugs[i],
+        "name": o['name'],
+        "kod": o['kod'],
+        "okres": o['okres'],
+        "kraj": o['kraj'],
+        "psc": o['psc'],
+        "lat": o['lat'],
+        "lon": o['lon'],
+        "nearestTaxiCities": [
+            {
+                "name": c['name'],
+                "slug": c['slug'],
+                "distanceKm": round(d, 1),
+                "taxiServices": c['taxiServices'],
+            }
+            for d, c in taxi
+        ],
+        "okresNeighbours": [
+            {
+                "name": obce[j]['name'],
+                "slug": slugs[j],
+                "psc": obce[j]['psc'],
+                "distanceKm": round(d, 1),
+            }
+            for d, j in neighbours[:options['neighbours']]
+        ],
+    }
+
+def process_okres(args):
+    """Zapíše bundly pre obce jedného okresu, vráti (okres, počet, zapísaných)"""
+    okres, options = args
+    written = 0
+    indices = _shared['by_okres'][okres]
+    for i in indices:
+        bundle = build_bundle(i, options)
+        path = os.path.join(options['out_dir'], f"{bundle['slug']}.json")
+        if write_json_if_changed(path, bundle, manifest=False, compact=True):
+            written += 1
+    return okres, len(indices), written
+
+def remove_stale(out_dir, index):
+    """Zmaže bundly, ktoré nie sú v index.json (zaniknutá alebo premenovaná obec)"""
+    keep = set(index.values())
+    removed = 0
+    for name in os.listdir(out_dir):
+        if name.endswith('.json') and name != 'index.json' and name not in keep:
+            os.remove(os.path.join(out_dir, name))
+            removed += 1
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundly dát pre stránky obcí")
+    parser.add_argument('--out-dir', default='municipality_bundles')
+    parser.add_argument('--taxi-cities', type=int, default=5, help="Počet najbližších miest s taxi")
+    parser.add_argument('--neighbours', type=int, default=10, help="Počet susedných obcí z okresu")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    shared = load_shared()
+    print(f"Načítaných {len(shared['obce'])} obcí, {len(shared['by_okres'])} okresov, "
+          f"{len(shared['taxi_cities'])} miest s taxi")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    options = {
+        "out_dir": args.out_dir,
+        "taxi_cities": args.taxi_cities,
+        "neighbours": args.neighbours,
+    }
+
+    if 'fork' in multiprocessing.get_all_start_methods():
+        # Workery zdedia _shared bez kopírovania; gc.freeze obmedzí copy-on-write
+        init_worker(shared)
+        gc.freeze()
+        pool = multiprocessing.get_context('fork').Pool(args.workers)
+    else:
+        pool = multiprocessing.Pool(args.workers, initializer=init_worker, initargs=(shared,))
+
+    # Najväčšie okresy najskôr
+    tasks = sorted(shared['by_okres'], key=lambda k: -len(shared['by_okres'][k]))
+    total = 0
+    written = 0
+    with pool:
+        for okres, count, changed in pool.imap_unordered(process_okres, [(k, options) for k in tasks]):
+            total += count
+            written += changed
+
+    # Index slug -> súbor pre prerender
+    index = {slug: f"{slug}.json" for slug in sorted(shared['slugs'])}
+    write_json_if_changed(os.path.join(args.out_dir, 'index.json'), index, manifest=False, compact=True)
+    removed = remove_stale(args.out_dir, index)
+
+    took = time.perf_counter() - start
+    print(f"\n✓ {total} bundlov v {args.out_dir}/ (zapísaných {written}, bez zmeny {total - written}, "
+          f"zmazaných {removed}) za {took:.1f}s")
+
+if __name__ == "__main__":
+    main()
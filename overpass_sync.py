@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Inkrementálna synchronizácia dát z Overpass API.
+
+Namiesto sťahovania všetkých prvkov sa pýta len na prvky zmenené od
+posledného behu (filter `newer`) a na zoznam aktuálnych ID (`out ids`, pár
+kB). Zmeny sa zlúčia podľa osm_id do existujúceho JSON súboru:
+  - zmenený/nový prvok       -> nahradí/pridá záznam
+  - prvok mimo zoznamu ID    -> záznam sa odstráni (zmazaný alebo zmenil typ)
+Súbor sa zapíše len ak sa niečo zmenilo.
+
+Stav (časová pečiatka dát z Overpass + hash súboru) je v
+overpass_sync_state.json. Plný beh skriptu stav zapíše; inkrementálny beh
+odmietne pokračovať, ak súbor medzitým prepísal iný skript. Stav sa
+commituje spolu s dátovými súbormi, ktoré popisuje - inak by čistý checkout
+nemohol bežať inkrementálne.
+
+Obmedzenie: `newer` porovnáva len časovú pečiatku samotného prvku. Zmena
+geometrie členských ciest (alebo ich uzlov) nezmení pečiatku relácie, takže
+`out center` relácií by zostal zastaraný. Skripty s reláciami (get_cities.py)
+preto cez full_run_due() pravidelne spustia plný beh.
+
+Cieľový súbor musí mať osm_id v každom zázname, preto skripty zapisujú OSM
+výstupy do vlastných súborov (obce_cz_osm.json, obce_cz_osm_places.json,
+mesta_cz_gps.json) - RÚIAN zoznam obce_cz_gps.json sa tu nikdy neprepisuje.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from data_utils import load_json, write_json_if_changed
+
+STATE_PATH = 'overpass_sync_state.json'
+USER_AGENT = 'TaxiVisionStudio/1.0'
+AREA_CZ = 'area["ISO3166-1"="CZ"]->.cz;'
+
+class SyncError(Exception):
+    pass
+
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_state():
+    try:
+        return load_json(STATE_PATH)
+    except FileNotFoundError:
+        return {}
+
+def save_state(name, path, data, full=True):
+    """Uloží časovú pečiatku Overpass odpovede a hash zapísaného súboru.
+
+    Pri plnom behu sa pečiatka uloží aj ako fullTimestamp, inkrementálny beh
+    ju prevezme z predchádzajúceho stavu.
+    """
+    timestamp = data.get('osm3s', {}).get('timestamp_osm_base')
+    if not timestamp:
+        return
+    state = load_state()
+    previous = state.get(name, {})
+    full_timestamp = timestamp if full else previous.get('fullTimestamp')
+    state[name] = {"path": path, "timestamp": timestamp, "sha256": file_sha256(path)}
+    if full_timestamp:
+        state[name]['fullTimestamp'] = full_timestamp
+    write_json_if_changed(STATE_PATH, state, manifest=False)
+
+def parse_timestamp(timestamp):
+    return datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=timezone.utc)
+
+def full_run_due(name, max_age_days):
+    """True ak posledný plný beh chýba alebo je starší ako max_age_days"""
+    full_timestamp = load_state().get(name, {}).get('fullTimestamp')
+    if not full_timestamp:
+        return True
+    age = datetime.now(timezone.utc) - parse_timestamp(full_timestamp)
+    return age.total_seconds() > max_age_days * 86400
+
+def build_query(selectors, out, timeout, since=None):
+    """Overpass QL: (selektory v oblasti CZ, voliteľne len novšie ako since); out"""
+    newer = f'(newer:"{since}")' if since else ''
+    body = '\n'.join(f'  {sel}(area.cz){newer};' for sel in selectors)
+    return f'[out:json][timeout:{timeout}];\n{AREA_CZ}\n(\n{body}\n);\nout {out};'
+
+def run_query(query, mirrors, timeout):
+    """Pošle query na prvý funkčný mirror, vráti JSON odpoveď"""
+    import requests
+
+    errors = []
+    for mirror in mirrors:
+        try:
+            response = requests.post(
+                mirror,
+                data={'data': query},
+                timeout=timeout,
+                headers={'User-Agent': USER_AGENT}
+            )
+            response.raise_for_status()
+            data = response.json()
+            print(f"  {mirror}: {len(response.content) / 1024:.1f} kB")
+            return data
+        except (requests.exceptions.RequestException, ValueError) as e:
+            errors.append(f"{mirror}: {e}")
+    raise SyncError("Všetky mirrory zlyhali: " + "; ".join(errors))
+
+def merge_changes(records, changed, current_ids, to_record):
+    """Zlúči zmenené prvky do záznamov podľa osm_id, vráti (záznamy, +, ~, -)"""
+    by_id = {r['osm_id']: r for r in records}
+    added = updated = removed = 0
+
+    for element in changed:
+        osm_id = element.get('id')
+        record = to_record(element)
+        if record is None:
+            if by_id.pop(osm_id, None) is not None:
+                removed += 1
+            continue
+        if osm_id not in by_id:
+            added += 1
+        elif by_id[osm_id] != record:
+            updated += 1
+        by_id[osm_id] = record
+
+    for osm_id in list(by_id):
+        if osm_id not in current_ids:
+            del by_id[osm_id]
+            removed += 1
+
+    merged = sorted(by_id.values(), key=lambda x: x['name'])
+    return merged, added, updated, removed
+
+def sync(name, path, selectors, out, to_record, mirrors, timeout=180, since=None):
+    """Inkrementálne aktualizuje path, vráti True ak sa súbor zmenil.
+
+    since (ISO 8601) umožní prvý inkrementálny beh nad súborom, ktorý
+    vznikol pred zavedením stavu - stav sa vtedy nekontroluje.
+    """
+    if not os.path.exists(path):
+        raise SyncError(f"{path} neexistuje - spusti najprv plný beh")
+    if since is None:
+        entry = load_state().get(name)
+        if not entry or entry.get('path') != path:
+            raise SyncError(f"Chýba stav pre {name} - spusti najprv plný beh alebo zadaj --since")
+        if file_sha256(path) != entry['sha256']:
+            raise SyncError(f"{path} bol zmenený mimo {name} - spusti najprv plný beh")
+        since = entry['timestamp']
+
+    records = load_json(path)
+    if any('osm_id' not in r for r in records):
+        raise SyncError(f"{path} neobsahuje osm_id - spusti najprv plný beh")
+
+    print(f"Zmeny od {since}...")
+    changed_data = run_query(build_query(selectors, out, timeout, since=since), mirrors, timeout)
+    changed = changed_data.get('elements', [])
+
+    print("Aktuálne ID...")
+    ids_data = run_query(build_query(selectors, 'ids', timeout), mirrors, timeout)
+    current_ids = {el['id'] for el in ids_data.get('elements', [])}
+    if not current_ids:
+        raise SyncError("Prázdny zoznam ID - odpoveď vyzerá neúplne, nič nezapisujem")
+
+    merged, added, updated, removed = merge_changes(records, changed, current_ids, to_record)
+    print(f"Zmenených prvkov: {len(changed)}, +{added} ~{updated} -{removed}")
+
+    written = write_json_if_changed(path, merged)
+    save_state(name, path, changed_data, full=False)
+    if written:
+        print(f"\n✓ Uložených {len(merged)} záznamov do {path}")
+    else:
+        print(f"\n✓ {path} bez zmeny ({len(merged)} záznamov)")
+    return written
+
+def run_incremental(*args, **kwargs):
+    """sync() pre CLI - chybu vypíše namiesto tracebacku a skončí s kódom 1"""
+    try:
+        return sync(*args, **kwargs)
+    except SyncError as e:
+        print(f"Chyba: {e}")
+        raise SystemExit(1)
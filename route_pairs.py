@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Generátor dvojíc mesto-mesto pre route stránky.
+
+Namiesto všetkých dvojíc (437 miest ~95k, 6259 obcí ~20M) použije mriežkový
+priestorový index a pre každé mesto vyberie len susedov vo vzdialenostnom
+pásme --min-km až --max-km. Susedia sa zoradia podľa počtu taxislužieb a
+veľkosti (mesto > obec), ponechá sa najviac --per-city najlepších.
+
+Dvojica sa zapíše raz (neorientovane), ak patrí medzi najlepších susedov
+aspoň jedného z miest. Výstup sa streamuje do JSONL súborov rozdelených
+podľa kraja (a po --shard-size riadkoch), kraje bežia paralelne. Shard sa
+zapíše do dočasného súboru a nahradí existujúci len ak sa líši; shardy,
+ktoré v behu nevznikli, sa zmažú.
+
+Použitie: python route_pairs.py [--source mesta|obce] [--min-km 5] [--max-km 60]
+                                [--per-city 20] [--out-dir route_pairs] [--workers N]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from multiprocessing import Pool
+
+from data_utils import (
+    MESTA_KOMPLET_PATH, OBCE_PATH, GridIndex, load_json, load_taxi_services, municipality_slugs,
+    replace_if_changed, to_slug,
+)
+
+# Stav workera (nastavený v init_worker)
+_points = None
+_index = None
+_options = None
+_top_cache = {}
+
+def load_points(source):
+    """Vráti zoznam bodov s taxi počtom a príznakom mesta"""
+    taxi_counts = {slug: len(services) for slug, services in load_taxi_services().items()}
+    mesta = load_json(MESTA_KOMPLET_PATH)
+    mesta_kody = {m['kod'] for m in mesta}
+    obce = load_json(OBCE_PATH)
+    # Rovnaké slugy ako v bundloch a dlaždiciach (homonymá s okresom)
+    slugs = dict(zip((o['kod'] for o in obce), municipality_slugs(obce)))
+    records = mesta if source == 'mesta' else obce
+
+    points = []
+    for i, r in enumerate(records):
+        mesto = r.get('kod') in mesta_kody
+        points.append({
+            "id": i,
+            "name": r['name'],
+            "slug": slugs.get(r.get('kod')) or to_slug(r['name']),
+            "kod": r.get('kod'),
+            "kraj": r.get('kraj', ''),
+            "lat": r['lat'],
+            "lon": r['lon'],
+            # Taxislužby sú v TAXI_SERVICES podľa slugu mesta (bez okresu)
+            "taxi": taxi_counts.get(to_slug(r['name']), 0) if mesto else 0,
+            "mesto": mesto,
+        })
+    return points
+
+def init_worker(points, options):
+    global _points, _index, _options, _top_cache
+    _points = points
+    _options = options
+    # Menšie bunky ako polomer = menej kandidátov mimo kruhu
+    _index = GridIndex(((p['lat'], p['lon'], p['id']) for p in points), cell_km=options['max_km'] / 3)
+    _top_cache = {}
+
+def rank_key(item):
+    d, p = item
+    return (-p['taxi'], -p['mesto'], d)
+
+def band(pid):
+    """Body v pásme min_km..max_km okolo bodu, [(vzdialenosť, id)]"""
+    p = _points[pid]
+    return [
+        (d, qid)
+        for d, qid in _index.query_radius(p['lat'], p['lon'], _options['max_km'])
+        if qid != pid and d >= _options['min_km']
+    ]
+
+def top_neighbours(pid, in_band=None):
+    """Najlepší susedia bodu v pásme, {id: vzdialenosť}"""
+    if pid in _top_cache:
+        return _top_cache[pid]
+    if in_band is None:
+        in_band = band(pid)
+    candidates = [(d, _points[qid]) for d, qid in in_band]
+    candidates.sort(key=rank_key)
+    if _options['per_city']:
+        candidates = candidates[:_options['per_city']]
+    top = {q['id']: d for d, q in candidates}
+    _top_cache[pid] = top
+    return top
+
+def process_kraj(args):
+    """Vygeneruje dvojice pre body jedného kraja a zapíše ich do shardov.
+
+    Vráti (kraj, počet dvojíc, súbory, zapísaných súborov).
+    """
+    kraj, pids = args
+    kraj_slug = to_slug(kraj) or 'nezname'
+    shard_size = _options['shard_size']
+    out_dir = _options['out_dir']
+
+    files = []
+    shard = None
+    tmp_path = None
+    lines_in_shard = 0
+    count = 0
+    written = 0
+
+    def open_shard():
+        nonlocal tmp_path
+        files.append(os.path.join(out_dir, f"pairs-{kraj_slug}-{len(files) + 1:04d}.jsonl"))
+        fd, tmp_path = tempfile.mkstemp(dir=out_dir, suffix='.tmp')
+        return open(fd, 'w', encoding='utf-8')
+
+    def close_shard():
+        nonlocal written, tmp_path
+        shard.close()
+        if replace_if_changed(tmp_path, files[-1]):
+            written += 1
+        tmp_path = None
+
+    try:
+        for pid in pids:
+            a = _points[pid]
+            in_band = band(pid)
+            top = top_neighbours(pid, in_band)
+            pairs = []
+            for d, qid in in_band:
+                # Každú neorientovanú dvojicu zapíše len bod s menším id
+                if qid < pid:
+                    continue
+                if qid in top or pid in top_neighbours(qid):
+                    pairs.append((d, _points[qid]))
+            pairs.sort(key=rank_key)
+
+            for d, b in pairs:
+                if shard is None or lines_in_shard >= shard_size:
+                    if shard:
+                        close_shard()
+                    shard = open_shard()
+                    lines_in_shard = 0
+                shard.write(json.dumps({
+                    "from": a['slug'],
+                    "to": b['slug'],
+                    "fromKod": a['kod'],
+                    "toKod": b['kod'],
+                    "airDistanceKm": round(d, 1),
+                    "taxi": a['taxi'] + b['taxi'],
+                }, ensure_ascii=False) + '\n')
+                lines_in_shard += 1
+                count += 1
+        if shard:
+            close_shard()
+    finally:
+        if tmp_path:
+            shard.close()
+            os.remove(tmp_path)
+
+    return kraj, count, files, written
+
+def main():
+    parser = argparse.ArgumentParser(description="Generátor dvojíc miest pre route stránky")
+    parser.add_argument('--source', choices=['mesta', 'obce'], default='mesta')
+    parser.add_argument('--min-km', type=float, default=5.0)
+    parser.add_argument('--max-km', type=float, default=60.0)
+    parser.add_argument('--per-city', type=int, default=20, help="Max. susedov na mesto (0 = všetci v pásme)")
+    parser.add_argument('--shard-size', type=int, default=50000, help="Max. riadkov v jednom súbore")
+    parser.add_argument('--out-dir', default='route_pairs')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    points = load_points(args.source)
+    print(f"Načítaných {len(points)} bodov ({args.source})")
+
+    os.makedirs(args.out_dir, exist_ok=True)
+
+    by_kraj = {}
+    for p in points:
+        by_kraj.setdefault(p['kraj'], []).append(p['id'])
+
+    options = {
+        "min_km": args.min_km,
+        "max_km": args.max_km,
+        "per_city": args.per_city,
+        "shard_size": args.shard_size,
+        "out_dir": args.out_dir,
+    }
+
+    # Najväčšie kraje najskôr, aby sa pool vyťažil rovnomerne
+    tasks = sorted(by_kraj.items(), key=lambda x: -len(x[1]))
+    total = 0
+    written = 0
+    keep = set()
+    with Pool(args.workers, initializer=init_worker, initargs=(points, options)) as pool:
+        for kraj, count, files, changed in pool.imap_unordered(process_kraj, tasks):
+            total += count
+            written += changed
+            keep.update(os.path.basename(f) for f in files)
+            print(f"  {kraj or '(bez kraja)'}: {count} dvojíc, {len(files)} súborov (zapísaných {changed})")
+
+    removed = 0
+    for name in os.listdir(args.out_dir):
+        if name.startswith('pairs-') and name.endswith('.jsonl') and name not in keep:
+            os.remove(os.path.join(args.out_dir, name))
+            removed += 1
+
+    took = time.perf_counter() - start
+    print(f"\n✓ Vygenerovaných {total} dvojíc do {args.out_dir}/ v {len(keep)} súboroch "
+          f"(zapísaných {written}, zmazaných {removed}) za {took:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,15 @@ Script to populate cities.json with scraped taxi services data.
 """
 
 import json
-from datetime import datetime
+import os
+import sys
+
+# data_utils is in the repository root; this file is also re-loaded by
+# load_module() on every change, so add the path only once
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+from data_utils import write_json_if_changed
 
 # Scraped taxi services data
 TAXI_SERVICES = {
@@ -289,37 +297,54 @@ TAXI_SERVICES = {
     ],
 }
 
+def build_city_services(svcs):
+    """Convert TAXI_SERVICES entries to the cities.json taxiServices format."""
+    services = []
+    for svc in svcs:
+        service = {
+            "name": svc["name"],
+            "phone": svc["phone"],
+            "isPremium": False,
+            "isPromotional": False
+        }
+        if "website" in svc:
+            service["website"] = svc["website"]
+        services.append(service)
+    return services
+
+def apply_taxi_services(data, taxi_services=TAXI_SERVICES, slugs=None):
+    """Fill taxiServices for cities in data['cities'], return the updated cities.
+
+    If slugs is given, only cities with those slugs are updated, and a listed
+    slug that is no longer in taxi_services gets its taxiServices cleared.
+    """
+    updated = []
+    for city in data['cities']:
+        slug = city['slug']
+        if slugs is not None and slug not in slugs:
+            continue
+        if slug in taxi_services:
+            city['taxiServices'] = build_city_services(taxi_services[slug])
+            updated.append(city)
+        elif slugs is not None and city.get('taxiServices'):
+            city['taxiServices'] = []
+            updated.append(city)
+    return updated
+
 def main():
     # Load existing cities.json
     with open('../src/data/cities.json', 'r', encoding='utf-8') as f:
         data = json.load(f)
 
     # Update each city with taxi services
-    for city in data['cities']:
-        slug = city['slug']
-        if slug in TAXI_SERVICES:
-            services = []
-            for svc in TAXI_SERVICES[slug]:
-                service = {
-                    "name": svc["name"],
-                    "phone": svc["phone"],
-                    "isPremium": False,
-                    "isPromotional": False
-                }
-                if "website" in svc:
-                    service["website"] = svc["website"]
-                services.append(service)
-            city['taxiServices'] = services
-            print(f"Updated {city['name']} with {len(services)} taxi services")
-
-    # Update timestamp
-    data['lastUpdated'] = datetime.utcnow().isoformat() + 'Z'
-
-    # Write back
-    with open('../src/data/cities.json', 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    for city in apply_taxi_services(data):
+        print(f"Updated {city['name']} with {len(city['taxiServices'])} taxi services")
 
-    print(f"\nDone! Updated cities.json with taxi services data.")
+    # Write back; lastUpdated changes only when the content does
+    if write_json_if_changed('../src/data/cities.json', data, stamp_key='lastUpdated'):
+        print(f"\nDone! Updated cities.json with taxi services data.")
+    else:
+        print(f"\nDone! cities.json already up to date.")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+Testy check_taxi_links.py proti lokálnemu stub HTTP serveru.
+
+Server beží na náhodnom porte a zaznamenáva prijaté požiadavky, takže sa dá
+overiť aj fallback HEAD -> GET a to, že pri platnej cache sa nič neposiela.
+"""
+import json
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+import check_taxi_links
+
+class StubHandler(BaseHTTPRequestHandler):
+    def reply(self, status, body=b'', headers=()):
+        self.server.requests.append((self.command, self.path))
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command == 'GET':
+            self.wfile.write(body)
+
+    def route(self):
+        if self.path == '/ok':
+            return self.reply(200, b'ok')
+        if self.path == '/nohead':
+            return self.reply(405 if self.command == 'HEAD' else 200, b'ok')
+        if self.path == '/redirect':
+            return self.reply(301, headers=[('Location', '/ok')])
+        if self.path == '/slow':
+            time.sleep(1.0)
+            return self.reply(200, b'ok')
+        return self.reply(404, b'not found')
+
+    do_HEAD = route
+    do_GET = route
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture(scope='module')
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def base_url(stub_server):
+    stub_server.requests.clear()
+    return f"http://127.0.0.1:{stub_server.server_address[1]}"
+
+def closed_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def run_checker(tmp_path, monkeypatch, services, *extra):
+    services_path = tmp_path / 'services.json'
+    services_path.write_text(json.dumps(services), encoding='utf-8')
+    cache_path = tmp_path / 'cache.json'
+    report_path = tmp_path / 'report.json'
+    monkeypatch.setattr(sys, 'argv', [
+        'check_taxi_links.py', '--services', str(services_path),
+        '--cache', str(cache_path), '--output', str(report_path), '--timeout', '0.5', *extra,
+    ])
+    check_taxi_links.main()
+    return json.loads(report_path.read_text(encoding='utf-8')), cache_path
+
+def report_by_url(report):
+    return {e['website']: e for entries in report.values() for e in entries if 'website' in e}
+
+def test_link_statuses(tmp_path, monkeypatch, stub_server, base_url):
+    refused = f"http://127.0.0.1:{closed_port()}/"
+    services = {
+        "praha": [
+            {"name": "OK", "phone": "+420 222 333 444", "website": f"{base_url}/ok"},
+            {"name": "Bez HEAD", "phone": "222333444", "website": f"{base_url}/nohead"},
+            {"name": "Presmerovanie", "phone": "123", "website": f"{base_url}/redirect"},
+        ],
+        "brno": [
+            {"name": "Chýba", "phone": "+420 541 000 000", "website": f"{base_url}/missing"},
+            {"name": "Odmietnuté", "website": refused},
+            {"name": "Neplatná URL", "website": "http://"},
+            {"name": "Pomalý", "website": f"{base_url}/slow"},
+            {"name": "Bez webu", "phone": "+420 541 111 111"},
+        ],
+    }
+    report, _ = run_checker(tmp_path, monkeypatch, services)
+    by_url = report_by_url(report)
+
+    ok = by_url[f"{base_url}/ok"]
+    assert ok['ok'] and ok['status'] == 200
+
+    # 405 na HEAD -> GET
+    nohead = by_url[f"{base_url}/nohead"]
+    assert nohead['ok'] and nohead['status'] == 200
+    assert ('GET', '/nohead') in stub_server.requests
+
+    redirect = by_url[f"{base_url}/redirect"]
+    assert redirect['ok'] and redirect['status'] == 200
+    assert redirect['finalUrl'] == f"{base_url}/ok"
+
+    missing = by_url[f"{base_url}/missing"]
+    assert not missing['ok'] and missing['status'] == 404
+
+    for url in (refused, "http://"):
+        assert not by_url[url]['ok']
+        assert by_url[url]['status'] is None
+        assert by_url[url]['error']
+
+    # Pri timeoute sa GET už neskúša
+    slow = by_url[f"{base_url}/slow"]
+    assert not slow['ok'] and slow['error'] == 'TimeoutError'
+    assert ('GET', '/slow') not in stub_server.requests
+
+    assert [e['phoneValid'] for e in report['praha']] == [True, True, False]
+    assert [e['phoneValid'] for e in report['brno']] == [True, False, False, False, True]
+    assert 'website' not in report['brno'][-1]
+
+def test_cache_hit_and_ttl_expiry(tmp_path, monkeypatch, stub_server, base_url):
+    services = {"praha": [{"name": "OK", "phone": "222333444", "website": f"{base_url}/ok"}]}
+
+    run_checker(tmp_path, monkeypatch, services)
+    assert stub_server.requests == [('HEAD', '/ok')]
+
+    # Druhý beh v rámci TTL ide celý z cache
+    stub_server.requests.clear()
+    report, cache_path = run_checker(tmp_path, monkeypatch, services)
+    assert stub_server.requests == []
+    assert report['praha'][0]['ok']
+
+    # Záznam starší ako TTL sa skontroluje znova
+    cache = json.loads(cache_path.read_text(encoding='utf-8'))
+    cache[f"{base_url}/ok"]['checkedAt'] = time.time() - 25 * 3600
+    cache_path.write_text(json.dumps(cache), encoding='utf-8')
+    run_checker(tmp_path, monkeypatch, services)
+    assert stub_server.requests == [('HEAD', '/ok')]
+
+    refreshed = json.loads(cache_path.read_text(encoding='utf-8'))
+    assert time.time() - refreshed[f"{base_url}/ok"]['checkedAt'] < 60
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Externé triedenie (sort_records) a streamovaný zápis (write_json_array_stream)
+musia dať bajtovo rovnaký výstup ako dump_json(sorted(...)).
+"""
+import os
+import random
+import stat
+
+import pytest
+
+from data_utils import dump_json, sort_records, write_json_array_stream
+
+def make_records(n, seed=7):
+    rng = random.Random(seed)
+    names = ["Aš", "Brno", "Nová Ves", "Žďár nad Sázavou", "Čáslav", "Ostrava", "Praha"]
+    records = []
+    for i in range(n):
+        records.append({
+            "name": rng.choice(names),
+            "kod": str(500000 + i),
+            "lat": rng.uniform(48.5, 51.1),
+            "lon": rng.uniform(12.0, 18.9),
+            "psc": rng.choice(["", "10000", None]),
+            "tags": {"population": rng.randint(0, 10 ** 6), "alt": [rng.random(), "x\ny", {"a": []}]},
+            "empty": {} if i % 3 else [],
+        })
+    return records
+
+def name_key(record):
+    return record['name']
+
+@pytest.mark.parametrize('run_size', [1, 7, 1000])
+def test_sort_records_matches_sorted(run_size):
+    records = make_records(200)
+    # Veľa rovnakých kľúčov - overí aj stabilitu pri spájaní behov
+    assert list(sort_records(records, key=name_key, run_size=run_size)) == sorted(records, key=name_key)
+
+@pytest.mark.parametrize('records', [
+    [],
+    [{}],
+    [[]],
+    [{"nested": {"list": [1, [2, [3, {}]]], "none": None}}],
+    make_records(1),
+    make_records(200),
+], ids=['empty', 'empty-dict', 'empty-list', 'nested', 'one', 'many'])
+@pytest.mark.parametrize('run_size', [3, 7, 1000])
+def test_stream_is_byte_identical(tmp_path, records, run_size):
+    key = lambda r: str(r.get('name', '')) if isinstance(r, dict) else ''
+    path = tmp_path / 'out.json'
+
+    count, written = write_json_array_stream(
+        str(path), sort_records(iter(records), key=key, run_size=run_size), manifest=False
+    )
+
+    assert count == len(records)
+    assert written
+    assert path.read_bytes() == dump_json(sorted(records, key=key))
+
+def test_spilled_runs_are_used_and_closed(tmp_path, monkeypatch):
+    import data_utils
+
+    spilled = []
+    spill = data_utils._spill_run
+
+    def tracking_spill(run, tmp_dir):
+        f = spill(run, tmp_dir)
+        spilled.append(f)
+        return f
+
+    monkeypatch.setattr(data_utils, '_spill_run', tracking_spill)
+    records = make_records(50)
+    path = tmp_path / 'out.json'
+    write_json_array_stream(str(path), sort_records(records, key=name_key, run_size=7), manifest=False)
+
+    assert len(spilled) == 8
+    assert all(f.closed for f in spilled)
+    assert path.read_bytes() == dump_json(sorted(records, key=name_key))
+
+def test_unchanged_output_is_not_rewritten(tmp_path):
+    records = make_records(30)
+    path = tmp_path / 'out.json'
+    path.write_bytes(dump_json(sorted(records, key=name_key)))
+    os.chmod(path, 0o640)
+    before = os.stat(path).st_mtime_ns
+
+    _, written = write_json_array_stream(str(path), sort_records(records, key=name_key, run_size=4), manifest=False)
+
+    assert not written
+    assert os.stat(path).st_mtime_ns == before
+    assert [p.name for p in tmp_path.iterdir()] == ['out.json']
+
+def test_replaced_file_keeps_mode(tmp_path):
+    path = tmp_path / 'out.json'
+    path.write_bytes(b'[]')
+    os.chmod(path, 0o644)
+
+    _, written = write_json_array_stream(str(path), iter(make_records(5)), manifest=False)
+
+    assert written
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
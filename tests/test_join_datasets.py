@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Testy joinov (join_datasets.py) a odvodenia mesta_cz_komplet.json
+(create_mesta_komplet.py) na malých fixture dátach.
+"""
+from create_mesta_komplet import build_mesta_komplet
+from join_datasets import join_osm, join_statut, mesta_from_joins
+
+def obec(kod, name, lat, lon, okres='Okres'):
+    return {"kod": kod, "name": name, "lat": lat, "lon": lon, "okres": okres, "kraj": "Kraj"}
+
+def node(osm_id, name, lat, lon):
+    return {"osm_id": osm_id, "name": name, "lat": lat, "lon": lon, "type": "town"}
+
+OBCE = [
+    obec("1", "Lhota", 50.000, 14.000),
+    obec("2", "Kladno", 50.020, 14.000),     # ~2.2 km od Lhoty
+    obec("3", "Kladno", 49.500, 15.800, okres='Chrudim'),
+    obec("4", "Jáchymov", 50.370, 12.910),
+]
+
+def test_join_statut_by_kod():
+    statut = [{"kod": "2", "name": "Kladno"}, {"kod": "999", "name": "Zaniknutá"}]
+    matched, unmatched = join_statut(OBCE, statut)
+    assert list(matched) == ["2"]
+    assert [s['name'] for s in unmatched] == ["Zaniknutá"]
+
+def test_same_name_preferred_within_radius():
+    # Uzol je bližšie k Lhote, ale Kladno s rovnakým názvom je tiež v okruhu
+    matched, unmatched, conflicts = join_osm(OBCE, [node(10, "Kladno", 50.005, 14.000)], radius_km=5)
+    assert list(matched) == ["2"]
+    assert matched["2"][0]['osm_id'] == 10
+    assert not unmatched and not conflicts
+
+def test_nearest_without_same_name():
+    matched, _, _ = join_osm(OBCE, [node(11, "Jiný názov", 50.004, 14.000)], radius_km=5)
+    assert list(matched) == ["1"]
+
+def test_conflict_keeps_closer_node():
+    nodes = [node(20, "Lhota", 50.010, 14.000), node(21, "Lhota", 50.001, 14.000)]
+    matched, unmatched, conflicts = join_osm(OBCE, nodes, radius_km=5)
+    assert matched["1"][0]['osm_id'] == 21
+    assert [c['osm_id'] for c in conflicts] == [20]
+    assert conflicts[0]['kod'] == "1"
+    assert not unmatched
+
+def test_unmatched_beyond_radius():
+    far = node(30, "Lhota", 50.200, 14.000)   # ~22 km
+    matched, unmatched, _ = join_osm(OBCE, [far], radius_km=5)
+    assert matched == {}
+    assert unmatched == [far]
+
+def test_mesta_from_joins_sorted_and_shaped():
+    mesta = mesta_from_joins(OBCE, {"2": {}}, {"1": (None, 0.1)})
+    assert [m['kod'] for m in mesta] == ["2", "1"]
+    assert set(mesta[0]) == {"name", "kod", "lat", "lon", "okres", "kraj"}
+
+def test_build_keeps_existing_towns_missing_from_inputs():
+    statut = [{"kod": "2", "name": "Kladno"}]
+    existing = [
+        obec("3", "Kladno", 49.500, 15.800, okres='Chrudim'),   # zlý kod z homonyma
+        obec("4", "Jáchymov", 50.0, 12.0),                       # chýba vo vstupoch
+        obec("777", "Zaniknuté", 50.0, 12.0),                    # kod už nie je v obciach
+    ]
+    mesta, report = build_mesta_komplet(OBCE, statut, [], existing)
+
+    assert [(m['name'], m['kod']) for m in mesta] == [("Jáchymov", "4"), ("Kladno", "2")]
+    # Súradnice sa berú z aktuálnych obcí
+    assert mesta[0]['lat'] == 50.370
+    assert report == {"notFound": [], "kept": ["Jáchymov"], "dropped": ["Zaniknuté"]}
+
+def test_build_is_stable_on_own_output():
+    statut = [{"kod": "2", "name": "Kladno"}]
+    first, _ = build_mesta_komplet(OBCE, statut, [], [obec("4", "Jáchymov", 50.370, 12.910)])
+    second, report = build_mesta_komplet(OBCE, statut, [], first)
+    assert second == first
+    assert report['kept'] == ["Jáchymov"]
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Testy inkrementálnej synchronizácie (overpass_sync.py) so stubnutým
+run_query - bez siete.
+"""
+import json
+
+import pytest
+
+import data_utils
+import overpass_sync
+from overpass_sync import SyncError, merge_changes
+
+TIMESTAMP = '2026-01-01T00:00:00Z'
+NEW_TIMESTAMP = '2026-01-02T00:00:00Z'
+
+def element_to_place(el):
+    """Rovnaký tvar záznamu ako get_cities_alt.element_to_place"""
+    tags = el.get('tags', {})
+    if not tags.get('name'):
+        return None
+    return {"name": tags['name'], "lat": el['lat'], "lon": el['lon'],
+            "type": tags.get('place', ''), "osm_id": el['id']}
+
+def element(osm_id, name, lat=50.0, lon=14.0, place='village'):
+    return {"type": "node", "id": osm_id, "lat": lat, "lon": lon,
+            "tags": {"name": name, "place": place}}
+
+def place(osm_id, name, lat=50.0, lon=14.0):
+    return element_to_place(element(osm_id, name, lat, lon))
+
+def ids(*osm_ids):
+    return {"elements": [{"type": "node", "id": i} for i in osm_ids]}
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.setattr(overpass_sync, 'STATE_PATH', str(tmp_path / 'state.json'))
+    monkeypatch.setattr(data_utils, 'MANIFEST_PATH', str(tmp_path / 'manifest.txt'))
+    return tmp_path
+
+def full_run(workdir, records):
+    """Zapíše súbor a stav ako plný beh"""
+    path = str(workdir / 'places.json')
+    data_utils.write_json_if_changed(path, records)
+    overpass_sync.save_state('test', path, {"osm3s": {"timestamp_osm_base": TIMESTAMP}})
+    return path
+
+def stub_overpass(monkeypatch, changed, current):
+    queries = []
+
+    def run_query(query, mirrors, timeout):
+        queries.append(query)
+        if 'out ids;' in query:
+            return current
+        return {"osm3s": {"timestamp_osm_base": NEW_TIMESTAMP}, "elements": changed}
+
+    monkeypatch.setattr(overpass_sync, 'run_query', run_query)
+    return queries
+
+def run_sync(path):
+    return overpass_sync.sync('test', path, ['node["place"]'], 'body', element_to_place, ['stub'])
+
+def test_merge_add_update_delete():
+    records = [place(1, "Lhota"), place(2, "Kladno"), place(3, "Beroun")]
+    changed = [element(2, "Kladno", lat=50.5), element(4, "Aš")]
+    merged, added, updated, removed = merge_changes(records, changed, {1, 2, 4}, element_to_place)
+
+    assert (added, updated, removed) == (1, 1, 1)
+    assert [r['osm_id'] for r in merged] == [4, 2, 1]
+    assert merged[1]['lat'] == 50.5
+
+def test_merge_unusable_element_removes_record():
+    records = [place(1, "Lhota")]
+    changed = [{"type": "node", "id": 1, "lat": 50.0, "lon": 14.0, "tags": {}}]
+    merged, added, updated, removed = merge_changes(records, changed, {1}, element_to_place)
+    assert merged == [] and removed == 1
+
+def test_sync_merges_and_advances_state(workdir, monkeypatch):
+    path = full_run(workdir, [place(1, "Lhota"), place(2, "Kladno")])
+    queries = stub_overpass(monkeypatch, [element(3, "Aš")], ids(1, 3))
+
+    assert run_sync(path) is True
+    assert f'(newer:"{TIMESTAMP}")' in queries[0]
+    with open(path, encoding='utf-8') as f:
+        assert [r['osm_id'] for r in json.load(f)] == [3, 1]
+
+    entry = overpass_sync.load_state()['test']
+    assert entry['timestamp'] == NEW_TIMESTAMP
+    assert entry['fullTimestamp'] == TIMESTAMP
+    assert entry['sha256'] == overpass_sync.file_sha256(path)
+
+def test_sync_refuses_empty_ids(workdir, monkeypatch):
+    path = full_run(workdir, [place(1, "Lhota")])
+    before = overpass_sync.file_sha256(path)
+    state_before = overpass_sync.load_state()
+    stub_overpass(monkeypatch, [], ids())
+
+    with pytest.raises(SyncError):
+        run_sync(path)
+    assert overpass_sync.file_sha256(path) == before
+    assert overpass_sync.load_state() == state_before
+
+def test_sync_refuses_file_changed_elsewhere(workdir, monkeypatch):
+    path = full_run(workdir, [place(1, "Lhota")])
+    data_utils.write_json_if_changed(path, [place(1, "Lhota"), place(2, "Kladno")])
+    queries = stub_overpass(monkeypatch, [], ids(1, 2))
+
+    with pytest.raises(SyncError, match='zmenený'):
+        run_sync(path)
+    assert queries == []
+
+def test_sync_refuses_records_without_osm_id(workdir, monkeypatch):
+    path = str(workdir / 'obce.json')
+    data_utils.write_json_if_changed(path, [{"name": "Lhota", "kod": "1", "lat": 50.0, "lon": 14.0}])
+    queries = stub_overpass(monkeypatch, [], ids(1))
+
+    with pytest.raises(SyncError, match='osm_id'):
+        overpass_sync.sync('test', path, ['node["place"]'], 'body', element_to_place, ['stub'],
+                           since=TIMESTAMP)
+    assert queries == []
+
+def test_sync_requires_existing_file(workdir, monkeypatch):
+    stub_overpass(monkeypatch, [], ids(1))
+    with pytest.raises(SyncError, match='neexistuje'):
+        run_sync(str(workdir / 'missing.json'))
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Testy pruningu dvojíc v route_pairs.py (pásmo vzdialeností + top-k susedia)
+proti výpočtu hrubou silou.
+"""
+import json
+import os
+import random
+
+import pytest
+
+import route_pairs
+from data_utils import haversine_km
+
+def make_points(n=120, seed=3):
+    rng = random.Random(seed)
+    points = []
+    for i in range(n):
+        mesto = rng.random() < 0.3
+        points.append({
+            "id": i,
+            "name": f"Obec {i}",
+            "slug": f"obec-{i}",
+            "kod": str(500000 + i),
+            "kraj": rng.choice(["Kraj A", "Kraj B"]),
+            "lat": rng.uniform(49.5, 50.5),
+            "lon": rng.uniform(14.0, 15.5),
+            "taxi": rng.randint(0, 5) if mesto else 0,
+            "mesto": mesto,
+        })
+    return points
+
+def run_pairs(tmp_path, points, per_city, min_km=5.0, max_km=40.0, shard_size=50):
+    options = {
+        "min_km": min_km,
+        "max_km": max_km,
+        "per_city": per_city,
+        "shard_size": shard_size,
+        "out_dir": str(tmp_path),
+    }
+    route_pairs.init_worker(points, options)
+    by_kraj = {}
+    for p in points:
+        by_kraj.setdefault(p['kraj'], []).append(p['id'])
+
+    rows = []
+    for task in by_kraj.items():
+        _, count, files, _ = route_pairs.process_kraj(task)
+        kraj_rows = []
+        for path in files:
+            with open(path, encoding='utf-8') as f:
+                kraj_rows.extend(json.loads(line) for line in f)
+        assert count == len(kraj_rows)
+        rows.extend(kraj_rows)
+    return rows
+
+def brute_force(points, per_city, min_km=5.0, max_km=40.0):
+    """Očakávané neorientované dvojice {(kod, kod)}"""
+    band = {}
+    for a in points:
+        band[a['id']] = [
+            (d, b) for b in points
+            if b['id'] != a['id'] and min_km <= (d := haversine_km(a['lat'], a['lon'], b['lat'], b['lon'])) <= max_km
+        ]
+    top = {}
+    for pid, items in band.items():
+        ranked = sorted(items, key=route_pairs.rank_key)
+        if per_city:
+            ranked = ranked[:per_city]
+        top[pid] = {b['id'] for _, b in ranked}
+
+    expected = set()
+    for pid, items in band.items():
+        for _, b in items:
+            if b['id'] in top[pid] or pid in top[b['id']]:
+                expected.add(tuple(sorted((points[pid]['kod'], b['kod']))))
+    return expected, top
+
+@pytest.mark.parametrize('per_city', [0, 3, 10])
+def test_pairs_match_brute_force(tmp_path, per_city):
+    points = make_points()
+    rows = run_pairs(tmp_path, points, per_city)
+    pairs = [tuple(sorted((r['fromKod'], r['toKod']))) for r in rows]
+
+    # Žiadne dvojice so sebou, každá neorientovaná dvojica raz
+    assert all(r['fromKod'] != r['toKod'] for r in rows)
+    assert len(pairs) == len(set(pairs))
+
+    expected, _ = brute_force(points, per_city)
+    assert set(pairs) == expected
+    assert all(5.0 - 0.05 <= r['airDistanceKm'] <= 40.0 + 0.05 for r in rows)
+
+def test_per_city_limit_respected(tmp_path):
+    points = make_points()
+    per_city = 3
+    rows = run_pairs(tmp_path, points, per_city)
+    _, top = brute_force(points, per_city)
+    by_kod = {p['kod']: p['id'] for p in points}
+
+    for r in rows:
+        a, b = by_kod[r['fromKod']], by_kod[r['toKod']]
+        # Dvojica vznikne, len ak je jeden bod medzi top-k susedmi druhého
+        assert b in top[a] or a in top[b]
+    assert all(len(t) <= per_city for t in top.values())
+
+def test_unchanged_shards_not_rewritten(tmp_path):
+    points = make_points(60)
+    run_pairs(tmp_path, points, 3, shard_size=20)
+    before = {name: os.stat(tmp_path / name).st_mtime_ns for name in os.listdir(tmp_path)}
+
+    run_pairs(tmp_path, points, 3, shard_size=20)
+    after = {name: os.stat(tmp_path / name).st_mtime_ns for name in os.listdir(tmp_path)}
+    assert after == before
+    assert not [name for name in after if name.endswith('.tmp')]
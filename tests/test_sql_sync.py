@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Testy diffingu a synchronizácie tabuliek (sql_sync.py).
+
+Bežia nad SQLite v pamäti. Ak je nastavená premenná SQL_SYNC_TEST_PG
+(napr. postgresql://postgres@/postgres?host=/tmp/pgdata), rovnaké testy
+bežia aj proti Postgres - tabuľky sa pred testom zrušia.
+"""
+import os
+
+import pytest
+
+import sql_sync
+from sql_sync import TABLES, Database, diff_rows, sync_table
+
+PG_URL = os.environ.get('SQL_SYNC_TEST_PG')
+
+OLD_TAXI_SPEC = {
+    "key": ["city_slug", "name"],
+    "columns": ["phone", "website", "position"],
+    "types": {"position": "INTEGER"},
+    "indexes": [["city_slug", "position"], ["phone"]],
+}
+
+@pytest.fixture(params=['sqlite', 'postgres'])
+def db(request):
+    if request.param == 'sqlite':
+        db = Database('sqlite:///:memory:')
+    else:
+        if not PG_URL:
+            pytest.skip("SQL_SYNC_TEST_PG nie je nastavené")
+        db = Database(PG_URL)
+        for table in TABLES:
+            db.execute(f"DROP TABLE IF EXISTS {table}")
+    yield db
+    db.close()
+
+def sync(db, table, rows, **kwargs):
+    db.begin()
+    try:
+        result = sync_table(db, table, TABLES[table], rows, batch_size=2, **kwargs)
+        if kwargs.get('dry_run'):
+            db.rollback()
+        else:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return tuple(len(x) for x in result)
+
+def table_rows(db, table):
+    spec = TABLES[table]
+    cols = ', '.join(spec['key'] + spec['columns'])
+    return sorted(tuple(r) for r in db.execute(f"SELECT {cols} FROM {table}").fetchall())
+
+def obec(kod, name='Obec', lat=50.0):
+    return (kod, name, 'Okres', 'CZ0100', 'Kraj', 'CZ010', '10000', lat, 14.5)
+
+def test_diff_rows():
+    existing = {('1',): ('1', 'a'), ('2',): ('2', 'b'), ('3',): ('3', 'c')}
+    rows = [('1', 'a'), ('2', 'B'), ('4', 'd')]
+    inserts, updates, deletes = diff_rows(existing, rows, 1)
+    assert inserts == [('4', 'd')]
+    assert updates == [('2', 'B')]
+    assert deletes == [('3',)]
+
+def test_first_load_and_noop_resync(db):
+    rows = [obec(str(k)) for k in range(1, 6)]
+    assert sync(db, 'obce', rows) == (5, 0, 0)
+    assert table_rows(db, 'obce') == sorted(rows)
+    assert sync(db, 'obce', rows) == (0, 0, 0)
+
+def test_update_and_delete(db):
+    rows = [obec(str(k)) for k in range(1, 6)]
+    sync(db, 'obce', rows)
+
+    changed = [obec('1', name='Nová', lat=50.123456789)] + rows[1:3] + [obec('9')]
+    assert sync(db, 'obce', changed) == (1, 1, 2)
+    assert table_rows(db, 'obce') == sorted(changed)
+    assert sync(db, 'obce', changed) == (0, 0, 0)
+
+def test_dry_run_writes_nothing(db):
+    rows = [obec('1'), obec('2')]
+    sync(db, 'obce', rows)
+    assert sync(db, 'obce', rows[:1], dry_run=True) == (0, 0, 1)
+    assert table_rows(db, 'obce') == sorted(rows)
+
+def test_full_reload(db):
+    rows = [obec('1'), obec('2')]
+    sync(db, 'obce', rows)
+    assert sync(db, 'obce', rows, full=True) == (2, 0, 0)
+    assert table_rows(db, 'obce') == sorted(rows)
+
+def test_same_company_twice_in_city(db):
+    rows = [
+        ('praha', 0, 'Taxi A', '+420 111 111 111', None),
+        ('praha', 1, 'Taxi A', '+420 222 222 222', None),
+    ]
+    assert sync(db, 'taxi_service_records', rows) == (2, 0, 0)
+    assert sync(db, 'taxi_service_records', rows) == (0, 0, 0)
+
+def test_migrates_old_taxi_schema(db, monkeypatch):
+    monkeypatch.setitem(TABLES, 'taxi_service_records', OLD_TAXI_SPEC)
+    sync(db, 'taxi_service_records', [('praha', 'Taxi A', '+420 111 111 111', None, 0)])
+    monkeypatch.undo()
+
+    rows = [
+        ('praha', 0, 'Taxi A', '+420 111 111 111', None),
+        ('praha', 1, 'Taxi A', '+420 222 222 222', None),
+    ]
+    assert sync(db, 'taxi_service_records', rows) == (2, 0, 0)
+    db.begin()
+    assert sql_sync.table_columns(db, 'taxi_service_records') == ['city_slug', 'position', 'name', 'phone', 'website']
+    db.commit()
+    assert table_rows(db, 'taxi_service_records') == sorted(rows)
+    assert sync(db, 'taxi_service_records', rows) == (0, 0, 0)
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+Watch režim pre dátové súbory.
+
+Načíta obce_cz_gps.json, zoznam miest a TAXI_SERVICES raz do pamäte a pri
+zmene súborov pregeneruje len dotknuté odvodené súbory:
+  - obce_cz_gps.json / mesta_statut.json /
+    mesta_cz_gps.json                   -> mesta_cz_komplet.json (joiny)
+  - scripts/populate_taxi_services.py -> taxiServices v cities.json
+    (pri štarte všetky slugy, potom len slugy, ktorých záznamy sa zmenili;
+    slug odstránený z TAXI_SERVICES dostane prázdne taxiServices)
+
+Zároveň beží lokálny HTTP server na dotazy nad dátami v pamäti:
+  GET /stats
+  GET /obec?kod=554979   alebo   /obec?name=Aš
+  GET /okres?name=Cheb
+  GET /nearest?lat=50.08&lon=14.43&limit=5
+  GET /taxi?slug=praha
+
+Použitie: python watch_data.py [--port 8765] [--interval 0.5] [--once]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from create_mesta_komplet import build_mesta_komplet
+from data_utils import (
+    CITIES_PATH, MESTA_GPS_PATH, MESTA_KOMPLET_PATH, MESTA_STATUT_PATH, OBCE_PATH,
+    TAXI_SERVICES_PATH, GridIndex, load_json, load_module, write_json_if_changed,
+)
+
+def get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+class WarmData:
+    """Dáta držané v pamäti + indexy pre rýchle dotazy"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.obce = []
+        self.obce_by_kod = {}
+        self.obce_by_name = {}
+        self.obce_by_okres = {}
+        self.obce_index = GridIndex(())
+        self.statut = []
+        self.osm_nodes = []
+        self.mesta_komplet = []
+        self.taxi_services = {}
+        self.taxi_module = None
+        self.cities = None
+
+    # --- načítanie vstupov ---
+
+    def load_obce(self):
+        obce = load_json(OBCE_PATH)
+        by_kod = {}
+        by_name = {}
+        by_okres = {}
+        for o in obce:
+            if o.get('kod'):
+                by_kod[str(o['kod'])] = o
+            by_name.setdefault(o['name'].lower(), []).append(o)
+            by_okres.setdefault(o.get('okres', ''), []).append(o)
+        index = GridIndex(((o['lat'], o['lon'], o) for o in obce), cell_km=10)
+        with self.lock:
+            self.obce = obce
+            self.obce_by_kod = by_kod
+            self.obce_by_name = by_name
+            self.obce_by_okres = by_okres
+            self.obce_index = index
+        print(f"  Načítaných {len(obce)} obcí z {OBCE_PATH}")
+
+    def load_statut(self):
+        statut = load_json(MESTA_STATUT_PATH)
+        with self.lock:
+            self.statut = statut
+        print(f"  Načítaných {len(statut)} štatútov z {MESTA_STATUT_PATH}")
+
+    def load_osm_nodes(self):
+        osm_nodes = load_json(MESTA_GPS_PATH)
+        with self.lock:
+            self.osm_nodes = osm_nodes
+        print(f"  Načítaných {len(osm_nodes)} OSM uzlov z {MESTA_GPS_PATH}")
+
+    def load_taxi_services(self):
+        """Načíta TAXI_SERVICES nanovo, vráti množinu slugov so zmenenými záznamami"""
+        module = load_module(TAXI_SERVICES_PATH, '_taxi_services')
+        new = module.TAXI_SERVICES
+        with self.lock:
+            old = self.taxi_services
+            changed = {slug for slug in set(old) | set(new) if old.get(slug) != new.get(slug)}
+            self.taxi_services = new
+            self.taxi_module = module
+        print(f"  Načítaných {len(new)} miest s taxislužbami, zmenených: {len(changed)}")
+        return changed
+
+    def load_mesta_komplet(self):
+        """Existujúci zoznam miest - základ, pod ktorý sa prepočet nezmenší"""
+        try:
+            mesta = load_json(MESTA_KOMPLET_PATH)
+        except FileNotFoundError:
+            mesta = []
+        with self.lock:
+            self.mesta_komplet = mesta
+
+    def load_cities(self):
+        if not os.path.exists(CITIES_PATH):
+            self.cities = None
+            return
+        with self.lock:
+            self.cities = load_json(CITIES_PATH)
+
+    # --- odvodené súbory ---
+
+    def rebuild_mesta_komplet(self):
+        start = time.perf_counter()
+        with self.lock:
+            mesta_final, report = build_mesta_komplet(self.obce, self.statut, self.osm_nodes, self.mesta_komplet)
+            self.mesta_komplet = mesta_final
+        written = write_json_if_changed(MESTA_KOMPLET_PATH, mesta_final)
+        took = (time.perf_counter() - start) * 1000
+        status = "zapísané" if written else "bez zmeny"
+        print(f"  {MESTA_KOMPLET_PATH}: {len(mesta_final)} miest, nespárovaných {len(report['notFound'])}, "
+              f"mimo joinov {len(report['kept'])} ({status}, {took:.1f} ms)")
+        if report['dropped']:
+            print(f"  Vypadnuté mestá (kod už nie je v {OBCE_PATH}): {report['dropped']}")
+        return written
+
+    def update_cities_taxi(self, slugs):
+        """Prepíše taxiServices len pre zadané slugy, vráti True ak sa súbor zmenil"""
+        if self.cities is None:
+            print(f"  {CITIES_PATH} neexistuje, preskakujem taxiServices")
+            return False
+        if not slugs:
+            return False
+
+        start = time.perf_counter()
+        with self.lock:
+            updated = self.taxi_module.apply_taxi_services(self.cities, self.taxi_services, slugs=slugs)
+            if not updated:
+                return False
+            written = write_json_if_changed(CITIES_PATH, self.cities, stamp_key='lastUpdated')
+        took = (time.perf_counter() - start) * 1000
+        print(f"  {CITIES_PATH}: aktualizovaných {len(updated)} miest ({took:.1f} ms)")
+        return written
+
+    # --- dotazy ---
+
+    def nearest(self, lat, lon, limit=5):
+        with self.lock:
+            index = self.obce_index
+        return [dict(o, distance_km=round(d, 2)) for d, o in index.nearest(lat, lon, k=limit)]
+
+    def stats(self):
+        with self.lock:
+            return {
+                "obce": len(self.obce),
+                "okresy": len(self.obce_by_okres),
+                "mesta_komplet": len(self.mesta_komplet),
+                "taxi_cities": len(self.taxi_services),
+                "cities_json": self.cities is not None,
+            }
+
+class Watcher:
+    """Sleduje mtime vstupných súborov a spúšťa len potrebné prepočty"""
+
+    def __init__(self, data):
+        self.data = data
+        self.mtimes = {}
+        self.failed = {}
+
+    def snapshot(self, paths):
+        for path in paths:
+            self.mtimes[path] = get_mtime(path)
+
+    def reload(self, path, load):
+        """Pri zmene path zavolá load(), vráti (načítané, výsledok).
+
+        mtime sa uloží až po úspešnom načítaní - rozpísaný alebo chybný súbor
+        sa skúsi znova pri ďalšej kontrole. Chyba sa pre rovnaký mtime vypíše
+        len raz.
+        """
+        mtime = get_mtime(path)
+        if mtime is None or mtime == self.mtimes.get(path):
+            return False, None
+        first = self.failed.get(path) != mtime
+        if first:
+            print(f"Zmena: {path}")
+        try:
+            result = load()
+        except Exception as e:
+            if first:
+                print(f"  Chyba pri načítaní {path}: {e}")
+            self.failed[path] = mtime
+            return False, None
+        self.mtimes[path] = mtime
+        self.failed.pop(path, None)
+        return True, result
+
+    def initial_load(self):
+        self.data.load_obce()
+        self.data.load_statut()
+        self.data.load_osm_nodes()
+        self.data.load_mesta_komplet()
+        self.data.load_cities()
+        self.data.load_taxi_services()
+        self.data.rebuild_mesta_komplet()
+        # Zmeny TAXI_SERVICES počas vypnutého watchera
+        self.data.update_cities_taxi(set(self.data.taxi_services))
+        self.snapshot([OBCE_PATH, MESTA_STATUT_PATH, MESTA_GPS_PATH, TAXI_SERVICES_PATH, CITIES_PATH])
+
+    def poll(self):
+        obce_changed, _ = self.reload(OBCE_PATH, self.data.load_obce)
+        statut_changed, _ = self.reload(MESTA_STATUT_PATH, self.data.load_statut)
+        osm_changed, _ = self.reload(MESTA_GPS_PATH, self.data.load_osm_nodes)
+        if obce_changed or statut_changed or osm_changed:
+            self.data.rebuild_mesta_komplet()
+
+        self.reload(CITIES_PATH, self.data.load_cities)
+
+        taxi_changed, slugs = self.reload(TAXI_SERVICES_PATH, self.data.load_taxi_services)
+        if taxi_changed and self.data.update_cities_taxi(slugs):
+            # Vlastný zápis nesmie spustiť opätovné načítanie
+            self.snapshot([CITIES_PATH])
+
+    def run(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Chyba pri spracovaní zmeny: {e}")
+
+def make_handler(data):
+    class Handler(BaseHTTPRequestHandler):
+        def send_json(self, payload, status=200):
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            try:
+                if url.path == '/stats':
+                    return self.send_json(data.stats())
+                if url.path == '/obec':
+                    if 'kod' in query:
+                        obec = data.obce_by_kod.get(query['kod'])
+                        return self.send_json(obec) if obec else self.send_json({"error": "not found"}, 404)
+                    return self.send_json(data.obce_by_name.get(query.get('name', '').lower(), []))
+                if url.path == '/okres':
+                    return self.send_json(data.obce_by_okres.get(query.get('name', ''), []))
+                if url.path == '/nearest':
+                    lat = float(query['lat'])
+                    lon = float(query['lon'])
+                    limit = int(query.get('limit', 5))
+                    return self.send_json(data.nearest(lat, lon, limit))
+                if url.path == '/taxi':
+                    return self.send_json(data.taxi_services.get(query.get('slug', ''), []))
+            except (KeyError, ValueError) as e:
+                return self.send_json({"error": f"bad request: {e}"}, 400)
+            self.send_json({"error": "not found"}, 404)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch režim pre dátové súbory")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--interval', type=float, default=0.5, help="Interval kontroly zmien v sekundách")
+    parser.add_argument('--once', action='store_true', help="Len načítať a pregenerovať, bez watch režimu")
+    args = parser.parse_args()
+
+    data = WarmData()
+    watcher = Watcher(data)
+    print("Načítavam dáta...")
+    watcher.initial_load()
+
+    if args.once:
+        return
+
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), make_handler(data))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"\n✓ HTTP server beží na http://127.0.0.1:{args.port}")
+    print(f"✓ Sledujem zmeny (interval {args.interval}s), Ctrl+C ukončí")
+
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        print("\nUkončujem...")
+        server.shutdown()
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()